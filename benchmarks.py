@@ -0,0 +1,248 @@
+"""
+Benchmarks for bonfig.
+
+Run with ``python benchmarks.py``, each benchmark prints a short summary of its results.
+"""
+
+import gc
+import time
+import tracemalloc
+
+from bonfig import Bonfig, Store
+from bonfig.core import BonfigType
+
+
+def _measure_memory(func):
+    """Call `func`, returning the result and the number of bytes retained by its allocations.
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = func()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return result, retained
+
+
+def bench_field_declaration(n=10000):
+    """Memory and time overhead of declaring `n` fields, spread across 100 sections, in a generated class.
+
+    """
+    def declare():
+        store = Store()
+        attrs = {'store': store}
+        sections = [store.Section('section_{}'.format(i)) for i in range(100)]
+        for i in range(n):
+            attrs['field_{}'.format(i)] = sections[i % 100].IntField(i)
+        return attrs
+
+    start = time.perf_counter()
+    attrs, declared = _measure_memory(declare)
+    declare_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cls, created = _measure_memory(lambda: BonfigType('Generated', (Bonfig,), dict(attrs)))
+    create_time = time.perf_counter() - start
+
+    return {'fields': n,
+            'bytes per field (declaration)': declared / n,
+            'bytes per field (class creation)': created / n,
+            'declaration time (s)': declare_time,
+            'class creation time (s)': create_time}
+
+
+def bench_shared_base(n=1000, sections=100, keys=20):
+    """Memory per instance for `n` instances with one overridden value, with and without a shared base store.
+
+    """
+    from bonfig.core import _freeze_mapping
+    from bonfig.stores import OverlayStore
+
+    data = {'section_{}'.format(i): {'key_{}'.format(j): str(j) for j in range(keys)} for i in range(sections)}
+    base = _freeze_mapping(data)
+
+    class Copied(Bonfig):
+        s = Store()
+        f = s.Section('section_0').Field()
+
+        def load(self, value):
+            self.s = {k: dict(v) for k, v in data.items()}
+            self.s['section_0']['key_0'] = value
+
+    class Shared(Copied):
+        def load(self, value):
+            self.s = OverlayStore(base, {'section_0': {'key_0': value}})
+
+    _, copied = _measure_memory(lambda: [Copied(str(i)) for i in range(n)])
+    _, shared = _measure_memory(lambda: [Shared(str(i)) for i in range(n)])
+
+    return {'instances': n,
+            'bytes per instance (copied)': copied / n,
+            'bytes per instance (shared base)': shared / n}
+
+
+def bench_datetime_parsing(n=100000):
+    """Time per read of datetime fields, compared with parsing using `strptime` directly.
+
+    """
+    import datetime
+
+    class Config(Bonfig):
+        s = Store()
+        fixed = s.DatetimeField(datetime.datetime(2020, 1, 2, 3, 4, 5), fmt='%Y-%m-%dT%H:%M:%S')
+        short = s.DatetimeField(datetime.datetime(2020, 1, 2), fmt='%d/%m/%Y')
+        iso = s.IsoDatetimeField(datetime.datetime(2020, 1, 2, 3, 4, 5))
+
+    c = Config()
+
+    def timed(func):
+        start = time.perf_counter()
+        for _ in range(n):
+            func()
+        return (time.perf_counter() - start) / n * 1e6
+
+    raw = c.s['fixed']
+    return {'reads': n,
+            'strptime %Y-%m-%dT%H:%M:%S (us)': timed(lambda: datetime.datetime.strptime(raw, '%Y-%m-%dT%H:%M:%S')),
+            'DatetimeField %Y-%m-%dT%H:%M:%S (us)': timed(lambda: c.fixed),
+            'DatetimeField %d/%m/%Y (us)': timed(lambda: c.short),
+            'IsoDatetimeField (us)': timed(lambda: c.iso)}
+
+
+def _unique_memory():
+    """Memory only used by this process (private pages) in bytes, read from `/proc`.
+
+    """
+    total = 0
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(line.split()[1]) * 1024
+    return total
+
+
+def measure_fork_memory(bonfig, prepare=None, children=4, requests=1000):
+    """Fork `children` processes which each read every field of `bonfig` `requests` times, running a full garbage
+    collection every 100 requests, as a long running server would. Reports the mean unique memory of each child.
+
+    Only works on Linux.
+    """
+    import os
+    import struct
+
+    if prepare is not None:
+        prepare(bonfig)
+
+    from bonfig.fields import Field
+
+    fields = [name for name in dir(type(bonfig)) if isinstance(getattr(type(bonfig), name), Field)]
+    pids, reads = [], []
+    for _ in range(children):
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            try:
+                for i in range(requests):
+                    for name in fields:
+                        getattr(bonfig, name)
+                    if i % 100 == 0:
+                        gc.collect()
+                os.write(w, struct.pack('<Q', _unique_memory()))
+            finally:
+                os._exit(0)
+        os.close(w)
+        pids.append(pid)
+        reads.append(r)
+
+    unique = []
+    for pid, r in zip(pids, reads):
+        os.waitpid(pid, 0)
+        unique.append(struct.unpack('<Q', os.read(r, 8))[0])
+        os.close(r)
+    return sum(unique) / len(unique)
+
+
+def bench_fork_memory(n=5000, children=4, requests=200):
+    """Per-child unique memory after forking, with and without `bonfig.fork.prepare_fork`.
+
+    """
+    import os
+    import sys
+
+    from bonfig.fork import prepare_fork
+
+    if not sys.platform.startswith('linux'):
+        return {}
+
+    def make():
+        store = Store()
+        attrs = {'s': store}
+        for i in range(n):
+            attrs['field_{}'.format(i)] = store.Section('section_{}'.format(i % 50)).Field(str(i) * 10)
+        return BonfigType('Large', (Bonfig,), attrs)()
+
+    plain = measure_fork_memory(make(), children=children, requests=requests)
+    prepared = measure_fork_memory(make(), prepare=prepare_fork, children=children, requests=requests)
+    if hasattr(gc, 'unfreeze'):
+        gc.unfreeze()
+    return {'children': children,
+            'unique bytes per child': plain,
+            'unique bytes per child (prepare_fork)': prepared}
+
+
+def bench_bulk_stream(n=50000):
+    """Records per second when creating `n` frozen instances from JSON Lines, using `Bonfig.__init__` for each record,
+    and using `bonfig.bulk.stream`.
+
+    """
+    import io
+    import json
+
+    from bonfig.bulk import stream
+
+    class Tenant(Bonfig):
+        s = Store()
+        name = s.Field()
+        region = s.Field('eu')
+        limits = s.Section('limits')
+        quota = limits.IntField(default=10)
+        ratio = limits.FloatField()
+        enabled = s.Section('features').BoolField()
+
+        def load(self, name, quota=None, ratio=None, enabled=None):
+            self.s = {'name': name, 'limits': {'ratio': str(ratio)}, 'features': {'enabled': str(enabled)}}
+            if quota is not None:
+                self.s['limits']['quota'] = str(quota)
+
+    text = '\n'.join(json.dumps({'name': 'tenant_{}'.format(i), 'quota': i, 'ratio': i / n, 'enabled': i % 2 == 0})
+                     for i in range(n))
+
+    def timed(func):
+        start = time.perf_counter()
+        count = sum(1 for _ in func())
+        return count / (time.perf_counter() - start)
+
+    return {'records': n,
+            'records/s (Bonfig.__init__)': timed(lambda: (Tenant(**json.loads(line))
+                                                          for line in io.StringIO(text))),
+            'records/s (stream)': timed(lambda: stream(Tenant, io.StringIO(text), 'jsonl')),
+            'records/s (stream, views)': timed(lambda: stream(Tenant, io.StringIO(text), 'jsonl', views=True))}
+
+
+BENCHMARKS = [bench_field_declaration, bench_shared_base, bench_datetime_parsing, bench_fork_memory,
+              bench_bulk_stream]
+
+
+def main():
+    for bench in BENCHMARKS:
+        print(bench.__name__)
+        for name, value in bench().items():
+            print("    {}: {}".format(name, round(value, 6) if isinstance(value, float) else value))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Profile the startup of a `Bonfig` subclass from the command line.
+
+Usage::
+
+    python -m bonfig package.module:Config [--arg VALUE ...] [--kwarg KEY=VALUE ...] [--json]
+"""
+
+import argparse
+import json
+import sys
+
+from bonfig.profiling import import_bonfig, profile_bonfig, format_report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bonfig',
+                                     description="Profile creating and accessing an instance of a Bonfig subclass.")
+    parser.add_argument('target', help="Bonfig subclass to profile, as 'package.module:Class'")
+    parser.add_argument('--arg', action='append', default=[], dest='args', metavar='VALUE',
+                        help="positional argument to pass to load(), can be repeated")
+    parser.add_argument('--kwarg', action='append', default=[], dest='kwargs', metavar='KEY=VALUE',
+                        help="keyword argument to pass to load(), can be repeated")
+    parser.add_argument('--no-freeze', action='store_false', dest='frozen', help="don't freeze the instance")
+    parser.add_argument('--repeat', type=int, default=1000, help="number of reads used to time repeated access")
+    parser.add_argument('--json', action='store_true', help="output report as JSON")
+    options = parser.parse_args(argv)
+
+    kwargs = {}
+    for kwarg in options.kwargs:
+        key, sep, value = kwarg.partition('=')
+        if not sep:
+            parser.error("--kwarg must be given as KEY=VALUE, not {!r}".format(kwarg))
+        kwargs[key] = value
+
+    sys.path.insert(0, '')
+    created = {}
+    try:
+        cls = import_bonfig(options.target, created)
+    except (ImportError, AttributeError, ValueError, TypeError) as e:
+        parser.error(str(e))
+
+    report = profile_bonfig(cls, options.args, kwargs, frozen=options.frozen, repeat=options.repeat,
+                            class_creation=created.get(cls))
+
+    if options.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+"""
+Streaming construction of many `Bonfig` instances from JSON Lines or CSV files.
+
+Creating instances through `Bonfig.__init__` calls `load`, then initialises each field in turn, walking its keys
+through the store, then freezes every store, making a copy of each section along the way. When creating many
+instances of the same class, most of this work is the same each time. A :py:class:`Layout` works out once per class
+where each field lives and what the constant (`Field.val`) values are, then builds each instance's frozen stores
+directly from a flat record, mapping field attribute names to values.
+
+Notes
+-----
+Instances created this way never have `Bonfig.load` called, their stores are built purely from the records.
+"""
+
+import concurrent.futures
+import csv
+import io
+import itertools
+import json
+import os
+import types
+import weakref
+
+from bonfig.core import _field_attrs
+from bonfig.fields import MISSING
+
+
+_layouts = weakref.WeakKeyDictionary()
+
+
+def _raw(field, value):
+    """Get the stored form of `value`, the value of `field` in a record.
+
+    Strings, as read from CSV or JSON, are taken to already be in stored form, unless the field's store holds its
+    type natively, other values are serialised by the field.
+    """
+    if not isinstance(value, str):
+        return field._pre_set(value)
+    if field._native is not None:
+        return field._pre_set(field._post_get(value))
+    return value
+
+
+class RecordView:
+    """
+    Read-only view of a single record, with the same attributes as an instance of its `Bonfig` class.
+
+    Values are converted on access, just as they would be when read from an instance, but no stores are built, so
+    views are much cheaper to create than instances.
+    """
+    __slots__ = ('_layout', '_record')
+
+    def __init__(self, layout, record):
+        self._layout = layout
+        self._record = record
+
+    def __getattr__(self, name):
+        try:
+            field = self._layout.fields[name]
+        except KeyError:
+            raise AttributeError("{} has no field {!r}".format(self._layout.bonfig_cls.__name__, name)) from None
+        constant = self._layout._constants.get(name, MISSING)
+        if constant is not MISSING:
+            return field._post_get(constant)
+        value = self._record.get(name, MISSING)
+        if value is MISSING or value is None:
+            if field.default_factory is not None:
+                return field._factory_default(None)
+            if field.default is None:
+                raise KeyError(name)
+            return field._post_get(field.default)
+        return field._post_get(_raw(field, value))
+
+    def instance(self):
+        """Create a frozen `Bonfig` instance from this record.
+
+        """
+        return self._layout.build(self._record)
+
+    def __repr__(self):
+        return "<{} view of {!r}>".format(self._layout.bonfig_cls.__name__, self._record)
+
+
+class Layout:
+    """
+    Precompiled description of how the fields of `bonfig_cls` are laid out within its stores.
+
+    Use :py:meth:`Layout.of` to get the (shared) layout of a class, rather than creating a new one each time.
+
+    Parameters
+    ----------
+    bonfig_cls : BonfigType
+
+    Attributes
+    ----------
+    fields : dict
+        Maps attribute names to `Field` s.
+    """
+
+    def __init__(self, bonfig_cls):
+        self.bonfig_cls = bonfig_cls
+        self.fields = _field_attrs(bonfig_cls)
+        self._constants = {}
+
+        # Stores and their sections are flattened into a list of nodes, each with a template of its constant values.
+        # Links from parent to child nodes are ordered so that, reversed, every node comes before its parent.
+        self._templates = []
+        self._roots = []
+        self._links = []
+        self._setters = []
+        node_ids = {}
+        for store_attr in sorted(bonfig_cls.__store_attrs__):
+            node_ids[(store_attr,)] = len(self._templates)
+            self._roots.append((store_attr, len(self._templates)))
+            self._templates.append({})
+
+        for attr_name, field in sorted(self.fields.items()):
+            node_path = (field.store_attr,)
+            for key in field._key_path[:-1]:
+                parent, node_path = node_ids[node_path], node_path + (key,)
+                if node_path not in node_ids:
+                    node_ids[node_path] = len(self._templates)
+                    self._links.append((parent, key, len(self._templates)))
+                    self._templates.append({})
+            node, key = node_ids[node_path], field._key_path[-1]
+            if field.val is not None:
+                value = field._pre_set(field.val)
+                self._templates[node][key] = value
+                self._constants[attr_name] = value
+            else:
+                self._setters.append((attr_name, node, key, field))
+        self._links.reverse()
+
+    @classmethod
+    def of(cls, bonfig_cls):
+        """Get layout of `bonfig_cls`, compiling it the first time it's needed.
+
+        """
+        layout = _layouts.get(bonfig_cls)
+        if layout is None:
+            layout = _layouts[bonfig_cls] = cls(bonfig_cls)
+        return layout
+
+    def stores(self, record):
+        """Build frozen stores for `record`, returned as a `dict` mapping store attribute names to stores.
+
+        Values that are missing from `record`, or are `None`, are left out of the stores, so that field defaults
+        apply. String values are kept as they are, as the stored form of their field (e.g. an ISO 8601 string for an
+        `IsoDatetimeField`), other values are serialised by their field. Keys that aren't fields are ignored, as are values of fields that have a `Field.val`, which take that
+        value instead, as they do when initialised normally.
+        """
+        nodes = [template.copy() for template in self._templates]
+        for attr_name, node, key, field in self._setters:
+            value = record.get(attr_name)
+            if value is not None:
+                nodes[node][key] = _raw(field, value)
+        for parent, key, child in self._links:
+            nodes[parent][key] = types.MappingProxyType(nodes[child])
+        return {store_attr: types.MappingProxyType(nodes[node]) for store_attr, node in self._roots}
+
+    def build(self, record):
+        """Create a frozen instance of `bonfig_cls` from `record`.
+
+        """
+        bonfig = self.bonfig_cls.__new__(self.bonfig_cls)
+        bonfig.__dict__.update(self.stores(record))
+        bonfig._frozen = True
+        return bonfig
+
+    def view(self, record):
+        """Create a :py:class:`RecordView` of `record`.
+
+        """
+        return RecordView(self, record)
+
+
+def _parse_json_lines(lines):
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def _json_records(f, executor, chunksize):
+    if executor is None:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+        return
+
+    # Keep a bounded number of chunks in flight, so memory use doesn't grow with the size of the file.
+    chunks = iter(lambda: list(itertools.islice(f, chunksize)), [])
+    pending = [executor.submit(_parse_json_lines, chunk) for chunk in itertools.islice(chunks, 4)]
+    while pending:
+        records = pending.pop(0).result()
+        for chunk in itertools.islice(chunks, 1):
+            pending.append(executor.submit(_parse_json_lines, chunk))
+        yield from records
+
+
+def _csv_records(f):
+    for row in csv.DictReader(f):
+        yield {k: v for k, v in row.items() if v != ''}
+
+
+def _format_of(source, format):
+    if format is not None:
+        return format
+    if isinstance(source, (str, os.PathLike)):
+        ext = os.path.splitext(os.fspath(source))[1].lower()
+        if ext in ('.jsonl', '.ndjson'):
+            return 'jsonl'
+        if ext == '.csv':
+            return 'csv'
+    raise ValueError("Unable to infer format of {!r}, pass format='jsonl' or format='csv'".format(source))
+
+
+def iter_records(source, format=None, executor=None, max_workers=None, chunksize=1000):
+    """Iterate over the records in `source`, one `dict` at a time.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or file-like
+        File to read. If a file-like, it must be opened in text mode.
+    format : {'jsonl', 'csv'}, optional
+        Format of `source`. By default inferred from the file extension of `source`.
+    executor : concurrent.futures.Executor, optional
+        Executor used to parse chunks of JSON Lines in parallel. By default records are parsed serially, unless
+        `max_workers` is given, in which case a `ProcessPoolExecutor` is used.
+    max_workers : int, optional
+        `max_workers` of the default executor.
+    chunksize : int, optional
+        Number of lines in each chunk parsed in parallel.
+
+    Notes
+    -----
+    Only JSON Lines are parsed in parallel: a CSV row can span several lines, so can't be split up ahead of parsing.
+    Empty CSV cells are treated as missing values.
+    """
+    format = _format_of(source, format)
+    if format not in ('jsonl', 'csv'):
+        raise ValueError("Unknown format {!r}, must be 'jsonl' or 'csv'".format(format))
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline='' if format == 'csv' else None) as f:
+            yield from iter_records(f, format, executor, max_workers, chunksize)
+        return
+
+    if format == 'csv':
+        yield from _csv_records(source)
+        return
+
+    if executor is None and max_workers is not None:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            yield from _json_records(source, executor, chunksize)
+        return
+    yield from _json_records(source, executor, chunksize)
+
+
+def stream(bonfig_cls, source, format=None, views=False, executor=None, max_workers=None, chunksize=1000):
+    """Lazily create an instance of `bonfig_cls` for every record in `source`.
+
+    Each record maps field attribute names to values. Instances are created one at a time, so memory use stays
+    constant however many records there are.
+
+    Parameters
+    ----------
+    bonfig_cls : BonfigType
+    source, format, executor, max_workers, chunksize
+        See :py:func:`iter_records`.
+    views : bool, optional
+        Yield :py:class:`RecordView` s rather than frozen instances.
+
+    Yields
+    ------
+    bonfig : Bonfig or RecordView
+
+    Examples
+    --------
+    >>> class Tenant(Bonfig):
+    ...     s = Store()
+    ...     name = s.Field()
+    ...     quota = s.Section('limits').IntField(default=10)
+    ...
+    >>> for tenant in stream(Tenant, 'tenants.jsonl'):
+    ...     print(tenant.name, tenant.quota)
+    acme 10
+    globex 250
+    """
+    layout = Layout.of(bonfig_cls)
+    make = layout.view if views else layout.build
+    for record in iter_records(source, format, executor, max_workers, chunksize):
+        yield make(record)
+
+
+def loads(bonfig_cls, text, format, views=False):
+    """As :py:func:`stream`, but reading records from string `text`.
+
+    """
+    return stream(bonfig_cls, io.StringIO(text, newline='' if format == 'csv' else None), format, views=views)
@@ -0,0 +1,215 @@
+"""
+Caching of frozen `Bonfig` instances.
+
+As frozen instances are immutable, they can safely be shared between any number of callers, this module provides
+:py:class:`InstanceCache`, which is used by :py:meth:`Bonfig.cached` to share instances by key.
+"""
+
+import collections
+import os
+import threading
+import time
+
+
+CacheStats = collections.namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'size', 'nbytes'])
+CacheStats.__doc__ = "Snapshot of the statistics of an :py:class:`InstanceCache`."
+
+
+def _stamp(sources):
+    """Get a tuple that changes whenever any of the files in `sources` do.
+
+    """
+    stamps = []
+    for source in sources:
+        try:
+            stat = os.stat(source)
+        except OSError:
+            stamps.append(None)
+        else:
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(stamps)
+
+
+class _Entry:
+    __slots__ = ('instance', 'expires', 'nbytes', 'sources', 'stamp')
+
+    def __init__(self, instance, expires, nbytes, sources, stamp):
+        self.instance = instance
+        self.expires = expires
+        self.nbytes = nbytes
+        self.sources = sources
+        self.stamp = stamp
+
+
+class _Flight:
+    """A load that's in progress, which other threads asking for the same key can wait on.
+
+    """
+    __slots__ = ('done', 'instance', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.instance = None
+        self.error = None
+
+
+class InstanceCache:
+    """
+    Thread-safe cache of frozen `Bonfig` instances with LRU, TTL and memory budget based eviction.
+
+    Concurrent misses on the same key are de-duplicated, such that only one thread calls the loader, while the others
+    wait for its result.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of instances to hold. `None` means no limit.
+    ttl : float, optional
+        Seconds an instance remains valid for after being loaded. `None` means forever.
+    max_bytes : int, optional
+        Approximate memory budget for the stores of cached instances, as measured by :py:func:`bonfig.core.sizeof`.
+        `None` means no limit.
+    timer : callable, optional
+        Function returning the current time in seconds, defaults to `time.monotonic`.
+
+    Examples
+    --------
+    >>> class Config(Bonfig):
+    ...     __instance_cache__ = InstanceCache(maxsize=1000, ttl=300)
+    ...     s = Store()
+    ...     db = s.Field()
+    ...
+    ...     def load(self, key):
+    ...         tenant, env = key
+    ...         with open('{}/{}.json'.format(tenant, env)) as f:
+    ...             self.s = json.load(f)
+    >>> c = Config.cached(('acme', 'prod'), sources=['acme/prod.json'])
+    >>> c is Config.cached(('acme', 'prod'), sources=['acme/prod.json'])
+    True
+    """
+
+    def __init__(self, maxsize=128, ttl=None, max_bytes=None, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.timer = timer
+
+        self._entries = collections.OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def stats(self):
+        """:py:class:`CacheStats` for this cache.
+
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._nbytes)
+
+    def _valid(self, entry):
+        if entry.expires is not None and self.timer() >= entry.expires:
+            return False
+        if entry.sources and _stamp(entry.sources) != entry.stamp:
+            return False
+        return True
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._nbytes -= entry.nbytes
+
+    def _evict(self):
+        while self._entries and ((self.maxsize is not None and len(self._entries) > self.maxsize) or
+                                 (self.max_bytes is not None and self._nbytes > self.max_bytes)):
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def get(self, key, loader, sources=None):
+        """Get instance for `key`, calling `loader()` to create it if it isn't cached.
+
+        Parameters
+        ----------
+        key : hashable
+            Key to cache instance under.
+        loader : callable
+            Called with no arguments to create a frozen `Bonfig` instance on a miss.
+        sources : iterable of str, optional
+            Paths of files the instance was loaded from. If any of these change, the cached instance is invalidated.
+
+        Returns
+        -------
+        bonfig : Bonfig
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    flight = self._flights.get(key)
+                    leader = flight is None
+                    if leader:
+                        flight = self._flights[key] = _Flight()
+                        self._misses += 1
+                    break
+
+            # Checking sources means calling os.stat, so is done without holding the lock
+            valid = self._valid(entry)
+            with self._lock:
+                if self._entries.get(key) is not entry:
+                    continue  # replaced or removed while checking, start over
+                if valid:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry.instance
+                self._remove(key)
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.instance
+
+        try:
+            sources = tuple(sources) if sources else ()
+            stamp = _stamp(sources)  # taken before loading, so changes made during the load aren't missed
+            instance = loader()
+            if not getattr(instance, '_frozen', False):
+                raise ValueError("Only frozen Bonfig instances can be cached")
+            flight.instance = instance
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            from bonfig.core import sizeof
+
+            nbytes = sizeof(instance) if self.max_bytes is not None else 0
+            expires = self.timer() + self.ttl if self.ttl is not None else None
+            with self._lock:
+                self._entries[key] = _Entry(instance, expires, nbytes, sources, stamp)
+                self._nbytes += nbytes
+                self._evict()
+            return instance
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def invalidate(self, key=None):
+        """Remove `key` from the cache, or everything if `key` is `None`.
+
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._nbytes = 0
+            elif key in self._entries:
+                self._remove(key)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
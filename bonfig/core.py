@@ -1,7 +1,14 @@
+import binascii
+import collections
+import contextlib
+import hashlib
 import sys
+import threading
+import time
 import types
 
-from bonfig.fields import Field, Store, Section
+from bonfig.fields import Field, Store, Section, MISSING, _dict_keys_get, _overrides
+from bonfig.stores import BaseStore, OverlayStore, VersionedStore, IniStore
 
 
 class BonfigType(type):
@@ -15,47 +22,359 @@ class BonfigType(type):
     """
 
     def __new__(mcs, name, bases, attrs, **kwargs):
-        """Creates Bonfig class type
+        """Creates Bonfig class type.
 
+        Uses built-in `dir` to get the fields of base-classes too. All of this is done here rather than in `__init__`,
+        so creating the class can be timed as a whole without passing state between the two.
         """
+        start = time.perf_counter() if _listener_count else None
         attrs['__fields__'] = set()
         attrs['__store_attrs__'] = set()
-        return super().__new__(mcs, name, bases, attrs, **kwargs)
+        attrs['__store_fields__'] = ()
+        cls = super().__new__(mcs, name, bases, attrs, **kwargs)
 
-    def __init__(cls, name, bases, attrs):
-        """Initialises Bonfig class type.
-
-        Uses built-in `dir` to get attributes of base-classes.
-        """
         if sys.version_info[1] < 6:  # Backport of __set_name__ from 3.6 :)
             for k, v in attrs.items():
                 if isinstance(v, (Field, Store, Section)):
                     v.__set_name__(cls, k)
 
-        fields = attrs['__fields__']
-        stores = attrs['__store_attrs__']
-
+        by_store = {}
         for attr_name in dir(cls):
             attr = getattr(cls, attr_name)
             if isinstance(attr, Field):
-                fields.add(attr)
-                stores.add(attr.store_attr)
+                cls.__fields__.add(attr)
+                cls.__store_attrs__.add(attr.store_attr)
+                by_store.setdefault(attr.store_attr, set()).add(attr)
+        cls.__store_fields__ = tuple((store_attr, tuple(by_store[store_attr])) for store_attr in sorted(by_store))
 
-        super().__init__(name, bases, attrs)
+        if start is not None:
+            _emit(cls, TimingEvent('class', cls, None, None, time.perf_counter() - start, None))
+        return cls
+
+
+def _field_attrs(cls):
+    """Map attribute names to each `Field` of `cls`.
+
+    """
+    attrs = {}
+    for attr_name in dir(cls):
+        attr = getattr(cls, attr_name)
+        if isinstance(attr, Field):
+            attrs[attr_name] = attr
+    return attrs
 
 
 def _freeze_mapping(d):
     """Recursively turn mapping into nested `types.MappingProxyTypes`
 
+    Instances of :py:class:`bonfig.stores.BaseStore` are instead frozen using their own `frozen` method.
     """
+    if isinstance(d, BaseStore):
+        return d.frozen()
     d = dict(d)
     for k in d.keys():
-        if hasattr(d[k], '__getitem__') and hasattr(d[k], 'keys'):
+        if _is_mapping(d[k]):
             d[k] = _freeze_mapping(d[k])
     d = types.MappingProxyType(d)
     return d
 
 
+def _is_mapping(obj):
+    return hasattr(obj, '__getitem__') and hasattr(obj, 'keys')
+
+
+Change = collections.namedtuple('Change', ['path', 'field', 'old', 'new'])
+Change.__doc__ = """
+A single difference between two `Bonfig` s, as produced by :py:meth:`Bonfig.diff`.
+
+Attributes
+----------
+path : tuple
+    Raw key path of the value, starting with the name of the store attribute.
+field : Field or None
+    The `Field` declared at `path`, or `None` if no field is declared there, e.g. for a whole section being added or
+    removed.
+old, new : object
+    Raw values, as found in the stores, or `MISSING` if not present.
+"""
+
+
+TimingEvent = collections.namedtuple('TimingEvent', ['phase', 'bonfig_cls', 'bonfig', 'store_attr', 'duration',
+                                                     'size'])
+TimingEvent.__doc__ = """
+Time taken by one phase of creating a `Bonfig` class or instance, passed to listeners added using
+:py:meth:`Bonfig.add_listener`.
+
+Attributes
+----------
+phase : str
+    One of:
+
+    * `'class'` - creating a `Bonfig` class, including collecting its fields.
+    * `'load'` - calling :py:meth:`Bonfig.load`.
+    * `'initialise'` - initialising the fields belonging to store `store_attr`.
+    * `'freeze'` - freezing store `store_attr`.
+bonfig_cls : BonfigType
+bonfig : Bonfig or None
+    Instance being created, or `None` for `'class'` events.
+store_attr : str or None
+    Store attribute name, for `'initialise'` and `'freeze'` events.
+duration : float
+    Seconds taken.
+size : int or None
+    Approximate number of bytes used by the store afterwards (see :py:func:`sizeof`), for `'initialise'` and
+    `'freeze'` events. `None` for stores that may load their data lazily, such as
+    :py:class:`bonfig.sqlite.SQLiteStore`, as measuring them would load all of it.
+"""
+
+_listener_count = 0
+_listener_lock = threading.Lock()
+
+
+def _emit(cls, event):
+    """Call every listener added to `cls`, or any of its bases, with `event`.
+
+    """
+    for klass in cls.__mro__:
+        for listener in klass.__dict__.get('_listeners', ()):
+            listener(event)
+
+
+def _diff_mappings(a, b, path, changes):
+    """Recursively find differences between mappings `a` and `b`, skipping over identical objects.
+
+    """
+    if a is b:
+        return
+    for key in a.keys():
+        old = a[key]
+        new = b[key] if key in b else MISSING
+        if old is new:
+            continue
+        if new is not MISSING and _is_mapping(old) and _is_mapping(new):
+            _diff_mappings(old, new, path + (key,), changes)
+        elif new is MISSING or old != new:
+            changes.append((path + (key,), old, new))
+    for key in b.keys():
+        if key not in a:
+            changes.append((path + (key,), MISSING, b[key]))
+
+
+_EMPTY = types.MappingProxyType({})
+
+
+def _replace_path(mapping, keys, value):
+    """Return a frozen copy of `mapping` with `value` at `keys`, sharing everything not on the path to `keys`.
+
+    If `value` is `MISSING` the value at `keys` is removed instead.
+    """
+    key = keys[0]
+    d = dict(mapping)
+    if len(keys) > 1:
+        d[key] = _replace_path(d.get(key, _EMPTY), keys[1:], value)
+    elif value is MISSING:
+        d.pop(key, None)
+    else:
+        d[key] = _freeze_mapping(value) if _is_mapping(value) else value
+    return types.MappingProxyType(d)
+
+
+def _replace_in_store(store, writes):
+    """Return a frozen copy of `store` with `writes`, pairs of key paths and values, applied.
+
+    Instances of :py:class:`bonfig.stores.BaseStore` apply them using their own `replaced` method.
+    """
+    if isinstance(store, BaseStore):
+        return store.replaced(writes)
+    for keys, value in writes:
+        store = _replace_path(store, keys, value)
+    return store
+
+
+def _leaf_digest(value):
+    return hashlib.sha256('{}:{!r}'.format(type(value).__qualname__, value).encode()).digest()[:16]
+
+
+def _digest(node, cache):
+    """Merkle digest of `node`: a hash of its value if it's not a mapping, otherwise of the keys and digests of its
+    children.
+
+    If `cache` is given, digests of frozen sections (`types.MappingProxyType` s) are memoised in it, keyed by `id`,
+    along with the section itself, so entries for sections that no longer exist are never mistaken for a new section
+    with the same `id`.
+
+    Returns
+    -------
+    digest : bytes
+    sections : int
+        Number of sections within `node`, including itself.
+    """
+    if not _is_mapping(node):
+        return _leaf_digest(node), 0
+
+    memoise = cache is not None and type(node) is types.MappingProxyType
+    if memoise:
+        entry = cache.get(id(node))
+        if entry is not None and entry[0] is node:
+            return entry[1], entry[2]
+
+    h = hashlib.sha256(b'{')
+    sections = 1
+    for key in sorted(node.keys(), key=repr):
+        digest, n = _digest(node[key], cache)
+        h.update(_leaf_digest(key))
+        h.update(digest)
+        sections += n
+    digest = h.digest()[:16]
+    if memoise:
+        cache[id(node)] = (node, digest, sections)
+    return digest, sections
+
+
+def _reachable(node, cache, kept):
+    """Copy the entries of `cache` for `node`, and every section within it, into `kept`.
+
+    """
+    entry = cache.get(id(node))
+    if entry is not None and entry[0] is node:
+        kept[id(node)] = entry
+    for key in node.keys():
+        value = node[key]
+        if _is_mapping(value):
+            _reachable(value, cache, kept)
+
+
+class Transaction:
+    """
+    Collects writes to a `Bonfig`, then applies them together. Created using :py:meth:`Bonfig.edit`.
+
+    Fields are written to as attributes of the transaction, or by item using the `Field` object itself. Reading
+    attributes gives the pending value if there is one, or else the current value from the `Bonfig`.
+
+    Attributes
+    ----------
+    result : Bonfig or None
+        The edited `Bonfig` once committed: the same instance, unless it's frozen, in which case it's a new frozen
+        instance.
+    """
+
+    def __init__(self, bonfig):
+        object.__setattr__(self, '_bonfig', bonfig)
+        object.__setattr__(self, '_writes', collections.OrderedDict())
+        object.__setattr__(self, 'result', None)
+
+    def _field(self, name):
+        field = getattr(self._bonfig.__class__, name, None)
+        if not isinstance(field, Field):
+            raise AttributeError("{} has no Field {}".format(self._bonfig.__class__.__name__, name))
+        return field
+
+    def __setattr__(self, name, value):
+        self._writes[self._field(name)] = value
+
+    def __getattr__(self, name):
+        field = self._field(name)
+        if field in self._writes:
+            return self._writes[field]
+        return field.__get__(self._bonfig, self._bonfig.__class__)
+
+    def __setitem__(self, field, value):
+        self._writes[field] = value
+
+    def __getitem__(self, field):
+        if field in self._writes:
+            return self._writes[field]
+        return field.__get__(self._bonfig, self._bonfig.__class__)
+
+    def _validate(self):
+        """Serialise every pending write, checking each can be read back, raising a single error if any can't.
+
+        """
+        raw, errors = collections.OrderedDict(), []
+        for field, value in self._writes.items():
+            try:
+                raw[field] = field._pre_set(value)
+                field._post_get(raw[field])
+            except (TypeError, ValueError, AttributeError) as e:
+                errors.append("{}: {!r} ({})".format(field.name, value, e))
+        if errors:
+            raise ValueError("Invalid values in transaction - " + "; ".join(errors))
+        return raw
+
+    def commit(self):
+        """Validate and apply all pending writes.
+
+        If the `Bonfig` is frozen, a new frozen instance is created instead, with new frozen stores which only
+        re-create the sections on the paths written to, sharing the rest with the old stores. Stores that are
+        instances of :py:class:`bonfig.stores.BaseStore` are edited using their `replaced` method, which for a
+        :py:class:`bonfig.stores.VersionedStore` commits a new version to the same, shared, store, so the old instance
+        sees the writes too.
+
+        Returns
+        -------
+        bonfig : Bonfig
+            The edited `Bonfig`, also kept as `result`.
+        """
+        bonfig = self._bonfig
+        raw = self._validate()
+
+        if not bonfig._frozen:
+            with bonfig.batch():
+                for field, value in self._writes.items():
+                    field.__set__(bonfig, value)
+            result = bonfig
+        else:
+            writes = collections.OrderedDict()
+            for field, value in raw.items():
+                writes.setdefault(field.store_attr, []).append((field._key_path, value))
+            result = bonfig._evolve({store_attr: _replace_in_store(getattr(bonfig, store_attr), store_writes)
+                                     for store_attr, store_writes in writes.items()})
+
+        self._writes.clear()
+        object.__setattr__(self, 'result', result)
+        return result
+
+
+_cache_lock = threading.Lock()
+
+
+def _sizeof(obj, seen):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, OverlayStore):  # the base is shared, so only count the overrides
+        return sys.getsizeof(obj) + _sizeof(obj.overlay, seen)
+
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__getitem__') and hasattr(obj, 'keys') and not isinstance(obj, (str, bytes)):
+        for k in obj.keys():
+            size += _sizeof(k, seen) + _sizeof(obj[k], seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += _sizeof(item, seen)
+    return size
+
+
+def _event_size(store):
+    """`_sizeof` of `store` for a `TimingEvent`, or `None` if `store` may load its data lazily.
+
+    """
+    if isinstance(store, BaseStore) and not isinstance(store, (OverlayStore, VersionedStore, IniStore)):
+        return None
+    return _sizeof(store, set())
+
+
+def sizeof(bonfig):
+    """Approximate number of bytes used by the stores of `bonfig`.
+
+    Stores that share data with other stores, such as :py:class:`bonfig.stores.OverlayStore`, only count the data
+    that they own.
+    """
+    seen = set()
+    return sum(_sizeof(getattr(bonfig, store_attr), seen) for store_attr in bonfig.__store_attrs__)
+
+
 class Bonfig(metaclass=BonfigType):
     """
     Base class for all Bonfigs.
@@ -82,17 +401,51 @@ class Bonfig(metaclass=BonfigType):
         a `set` containing all the classes `Field` attributes.
     __store_attrs__ : set
         a `set` containing the names of each store attribute for that class
+    __store_fields__ : tuple
+        pairs of store attribute names, sorted, and a `tuple` of the `Field` s belonging to that store.
+    __instance_cache__ : InstanceCache, optional
+        cache used by :py:meth:`Bonfig.cached`. If not set, an `InstanceCache` with default settings is created the
+        first time it's needed.
 
     Examples
     --------
 
     """
 
+    __instance_cache__ = None
+
+    _subscribers = ()
+
+    _frozen = False
+
     def __init__(self, *args, frozen=True, **kwargs):
-        self.load(*args, **kwargs)
+        self._frozen = False
+        timed = _listener_count
+        cls = self.__class__
 
-        for field in self.__fields__:
-            field._initialise(self)
+        if timed:
+            start = time.perf_counter()
+        self.load(*args, **kwargs)
+        if timed:
+            _emit(cls, TimingEvent('load', cls, self, None, time.perf_counter() - start, None))
+
+        for store_attr, fields in self.__store_fields__:
+            if timed:
+                start = time.perf_counter()
+            # initial values of a VersionedStore are written as part of its current version, not each a new one
+            store = getattr(self, store_attr, None)
+            amend = isinstance(store, VersionedStore)
+            if amend:
+                store._amending = True
+            try:
+                for field in fields:
+                    field._initialise(self)
+            finally:
+                if amend:
+                    store._amending = False
+            if timed:
+                duration = time.perf_counter() - start
+                _emit(cls, TimingEvent('initialise', cls, self, store_attr, duration, _event_size(store)))
 
         if frozen:
             self.freeze()
@@ -128,7 +481,443 @@ class Bonfig(metaclass=BonfigType):
         -----
         In order to 'freeze' your store, it each container needs to implement both `__getitem__()` and `keys()` as a
         minimum.
+
+        Stores that are instances of :py:class:`bonfig.stores.BaseStore` are frozen using their own
+        :py:meth:`~bonfig.stores.BaseStore.frozen` method instead, e.g. :py:class:`bonfig.stores.OverlayStore` only
+        freezes its overrides, and shares the rest with its base.
         """
-        for store_attr in self.__store_attrs__:
+        timed = _listener_count
+        for store_attr, _ in self.__store_fields__:
+            if timed:
+                start = time.perf_counter()
             frozen = _freeze_mapping(getattr(self, store_attr))
             setattr(self, store_attr, frozen)
+            if timed:
+                duration = time.perf_counter() - start
+                _emit(self.__class__, TimingEvent('freeze', self.__class__, self, store_attr, duration,
+                                                  _event_size(frozen)))
+        self._frozen = True
+
+    @classmethod
+    def add_listener(cls, callback):
+        """Call `callback` with a :py:class:`TimingEvent` for each phase of creating this class's subclasses and
+        instances (including instances of subclasses).
+
+        Add listeners to `Bonfig` itself to time every class and instance. When no listeners have been added anywhere,
+        timing costs a single check per instance.
+
+        Parameters
+        ----------
+        callback : callable
+            Called with a :py:class:`TimingEvent`.
+
+        Returns
+        -------
+        remove : callable
+            Call to stop `callback` receiving events.
+
+        Examples
+        --------
+        >>> def record(event):
+        ...     metrics.timing('config.{}'.format(event.phase), event.duration, tags={'store': event.store_attr})
+        >>> Bonfig.add_listener(record)
+        """
+        global _listener_count
+        with _listener_lock:
+            cls._listeners = cls.__dict__.get('_listeners', ()) + (callback,)
+            _listener_count += 1
+
+        def remove():
+            global _listener_count
+            with _listener_lock:
+                listeners = cls.__dict__.get('_listeners', ())
+                if callback in listeners:
+                    index = listeners.index(callback)
+                    cls._listeners = listeners[:index] + listeners[index + 1:]
+                    _listener_count -= 1
+
+        return remove
+
+    def _evolve(self, stores):
+        """Create a copy of `self`, without calling `__init__`, with some store attributes replaced.
+
+        The copy starts with no subscribers, and nothing cached by its fields.
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        for attr in ('_field_cache', '_subscribers', '_pending'):
+            new.__dict__.pop(attr, None)
+        new.__dict__.update(stores)
+        return new
+
+    def diff(self, other):
+        """Find differences between the stores of `self` and `other`.
+
+        Stores are compared recursively, skipping any sections that are the same object in both, such as those
+        shared from the base of a :py:class:`bonfig.stores.OverlayStore`, or left untouched by
+        :py:meth:`Bonfig.apply_patch`.
+
+        Parameters
+        ----------
+        other : Bonfig
+            Bonfig to compare against, typically another instance of the same class.
+
+        Returns
+        -------
+        changes : list of Change
+            Changes that would turn `self` into `other`.
+        """
+        fields = {(field.store_attr,) + field._key_path: field for field in self.__fields__}
+        found = []
+        for store_attr in sorted(self.__store_attrs__ | other.__store_attrs__):
+            _diff_mappings(getattr(self, store_attr, _EMPTY), getattr(other, store_attr, _EMPTY),
+                           (store_attr,), found)
+        return [Change(path, fields.get(path), old, new) for path, old, new in found]
+
+    def apply_patch(self, changes):
+        """Apply `changes`, as produced by :py:meth:`Bonfig.diff`, to the stores of `self`.
+
+        If `self` isn't frozen, its stores are updated in place. If `self` is frozen, a new frozen instance is
+        created instead, which shares every section of its stores with `self`, other than those on the paths of
+        `changes`.
+
+        Parameters
+        ----------
+        changes : iterable of Change
+            Changes to apply. Only `path` and `new` are used.
+
+        Returns
+        -------
+        bonfig : Bonfig
+            `self` if not frozen, else a new instance.
+        """
+        if not self._frozen:
+            with self.batch():
+                for change in changes:
+                    path, new = change.path, change.new
+                    d = getattr(self, path[0])
+                    for key in path[1:-1]:
+                        if key not in d:
+                            d[key] = d.__class__()
+                        d = d[key]
+                    if new is MISSING:
+                        del d[path[-1]]
+                    else:
+                        d[path[-1]] = new
+                    if self._subscribers:
+                        self._changed(change)
+            return self
+
+        writes = collections.OrderedDict()
+        for path, field, old, new in changes:
+            writes.setdefault(path[0], []).append((path[1:], new))
+        return self._evolve({store_attr: _replace_in_store(getattr(self, store_attr), store_writes)
+                             for store_attr, store_writes in writes.items()})
+
+    def _versioned_stores(self):
+        return {store_attr: getattr(self, store_attr) for store_attr in self.__store_attrs__
+                if isinstance(getattr(self, store_attr), VersionedStore)}
+
+    def history(self):
+        """Get the versions kept by each :py:class:`bonfig.stores.VersionedStore` store of `self`.
+
+        Returns
+        -------
+        versions : dict
+            Mapping of store attribute names to lists of version numbers, oldest first.
+        """
+        return {store_attr: store.versions for store_attr, store in self._versioned_stores().items()}
+
+    def rollback(self, version=None):
+        """Roll back each :py:class:`bonfig.stores.VersionedStore` store of `self`.
+
+        Parameters
+        ----------
+        version : int or dict, optional
+            Version to roll back to, or a mapping of store attribute names to versions, as returned by
+            :py:meth:`Bonfig.history`. By default, each store is rolled back to its previous version.
+        """
+        for store_attr, store in self._versioned_stores().items():
+            if isinstance(version, dict):
+                if store_attr in version:
+                    store.rollback(version[store_attr])
+            else:
+                store.rollback(version)
+
+    def snapshot(self):
+        """Get a frozen copy of `self` pinned to the current version of each :py:class:`bonfig.stores.VersionedStore`.
+
+        The snapshot is unaffected by later writes, reloads or rollbacks, making it suitable for handing to work that
+        should see a consistent configuration throughout.
+
+        If `self` isn't frozen, its other stores are frozen copies, as made by :py:meth:`Bonfig.freeze`. Stores that
+        can't be copied, i.e. instances of :py:class:`bonfig.stores.BaseStore` other than
+        :py:class:`bonfig.stores.VersionedStore` and :py:class:`bonfig.stores.OverlayStore` that aren't frozen,
+        raise `TypeError`.
+        """
+        stores = {}
+        for store_attr in self.__store_attrs__:
+            store = getattr(self, store_attr)
+            if isinstance(store, VersionedStore):
+                stores[store_attr] = store.snapshot()
+            elif self._frozen or getattr(store, 'is_frozen', False):
+                continue
+            elif isinstance(store, BaseStore) and not isinstance(store, OverlayStore):
+                raise TypeError("Unable to snapshot unfrozen {!r}".format(store))
+            else:
+                stores[store_attr] = _freeze_mapping(store)
+        snapshot = self._evolve(stores)
+        snapshot._frozen = True
+        return snapshot
+
+    def fingerprint(self, target=None):
+        """Get a fingerprint of the values in the stores of `self`, for use as a cache key.
+
+        Fingerprints are the root of a Merkle tree over the stores: each section's digest is a hash of the keys and
+        digests of its contents. For frozen instances, the digests of frozen sections are memoised, so after an edit
+        (see :py:meth:`Bonfig.edit`), only the sections on the path to the values that changed are hashed again, with
+        the rest shared with the previous stores.
+
+        Equal fingerprints mean equal stored values. Values are compared by type and `repr`, so `1` and `'1'` differ.
+        Instances themselves are still compared and hashed by identity, as the values of even a frozen instance can
+        change, e.g. when a :py:class:`bonfig.stores.VersionedStore` is reloaded, so key caches on the fingerprint.
+
+        Parameters
+        ----------
+        target : Field, Section or Store, optional
+            Only fingerprint the values within `target`, e.g. so a component can be keyed on just the part of the
+            config it depends on. By default, every store is included.
+
+        Returns
+        -------
+        fingerprint : str
+            Hex digest.
+
+        Examples
+        --------
+        >>> c.fingerprint()
+        '5f1c0d8b2e9a43d7a1c6e0f4b8d2a7e3'
+        >>> models[c.fingerprint(Config.model)]
+        """
+        cache = self.__dict__.get('_fingerprints') if self._frozen else None
+        if cache is None and self._frozen:
+            cache = self.__dict__['_fingerprints'] = {}
+
+        if target is None:
+            h = hashlib.sha256()
+            total = 0
+            for store_attr in sorted(self.__store_attrs__):
+                digest, sections = _digest(getattr(self, store_attr), cache)
+                h.update(_leaf_digest(store_attr))
+                h.update(digest)
+                total += sections
+            digest = h.digest()[:16]
+
+            # Entries for sections replaced by edits build up over time, drop them once they outnumber those in use
+            if cache is not None and len(cache) > 2 * total + 16:
+                kept = {}
+                for store_attr in self.__store_attrs__:
+                    store = getattr(self, store_attr)
+                    if _is_mapping(store):
+                        _reachable(store, cache, kept)
+                self.__dict__['_fingerprints'] = kept
+        else:
+            if isinstance(target, Store):
+                node = getattr(self, target.name)
+            else:
+                node = _dict_keys_get(getattr(self, target.store.name), target._key_path)
+            digest, _ = _digest(node, cache)
+
+        return binascii.hexlify(digest).decode('ascii')
+
+    @contextlib.contextmanager
+    def edit(self):
+        """Context manager for editing several fields at once, as a single transaction.
+
+        Writes are collected by the yielded :py:class:`Transaction`, then validated together when the `with` block
+        exits. If any are invalid, or an exception is raised within the block, none are applied.
+
+        Frozen instances can be edited this way too, in which case the edited copy is available as `tx.result` after
+        the `with` block. Its stores are new frozen stores, which only re-freeze the sections that were written to,
+        sharing the rest with `self`. Stores that are instances of :py:class:`bonfig.stores.BaseStore` are edited
+        using :py:meth:`bonfig.stores.BaseStore.replaced`, e.g. a :py:class:`bonfig.stores.VersionedStore` gets a new
+        version, rather than being copied. As `self` shares that store, it sees the new version too, use
+        :py:meth:`Bonfig.snapshot` first to keep a copy pinned to the old one.
+
+        Examples
+        --------
+        >>> with c.edit() as tx:
+        ...     tx.host = 'example.com'
+        ...     tx.port = 8080
+        >>> c = tx.result  # if c is frozen
+        """
+        tx = Transaction(self)
+        yield tx
+        tx.commit()
+
+    @contextlib.contextmanager
+    def override(self, **values):
+        """Context manager that temporarily overrides the values of fields, only within the current context.
+
+        Overrides are held in a `contextvars.ContextVar`, so they only apply to the thread or asyncio task that
+        entered the `with` block (and tasks it starts), while other threads and tasks see the usual values. Stores
+        aren't touched, so frozen instances can be overridden too. Overrides can be nested, with the innermost taking
+        precedence.
+
+        On Python < 3.7, where `contextvars` isn't available, overrides are scoped to the current thread.
+
+        Parameters
+        ----------
+        **values
+            Field attribute names, and the values to use for them. Values are serialised and de-serialised as they
+            would be if written to the store, so `c.override(port='80')` of an `IntField` gives `c.port == 80`.
+
+        Examples
+        --------
+        >>> with c.override(debug=True, port=8080):
+        ...     c.port
+        8080
+        >>> c.port
+        80
+        """
+        tx = Transaction(self)
+        for name, value in values.items():
+            setattr(tx, name, value)
+        raw = tx._validate()
+
+        overrides = dict(_overrides.get() or {})
+        for field, value in raw.items():
+            overrides[id(self), field] = (self, field._post_get(value))
+
+        token = _overrides.set(overrides)
+        try:
+            yield self
+        finally:
+            _overrides.reset(token)
+
+    def subscribe(self, callback, target=None):
+        """Call `callback` whenever values are written to `self`, or to part of `self`.
+
+        Writes are delivered in batches: `callback` is called once per batch (see :py:meth:`Bonfig.batch`) with a
+        `list` of :py:class:`Change` s, after all of the writes in that batch have been made. Writes outside of a
+        batch are delivered straight away, each as a batch of one. If the same path is written to more than once in a
+        batch, these are coalesced into a single `Change`.
+
+        Parameters
+        ----------
+        callback : callable
+            Called with a list of changes.
+        target : Field, Section or Store, optional
+            Only deliver changes to values belonging to `target`. By default all changes are delivered.
+
+        Returns
+        -------
+        unsubscribe : callable
+            Call to stop `callback` receiving changes.
+        """
+        if target is None:
+            prefix = ()
+        elif isinstance(target, Store):
+            prefix = (target.name,)
+        else:
+            prefix = (target.store.name,) + target._key_path
+
+        if not self._subscribers:
+            self._subscribers = []
+            self._pending = None
+        subscriber = (prefix, callback)
+        self._subscribers.append(subscriber)
+
+        def unsubscribe():
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+        return unsubscribe
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Context manager that collects changes made within it, then delivers them to subscribers all at once on exit.
+
+        Batches can be nested, in which case changes are delivered when the outermost batch exits.
+
+        Examples
+        --------
+        >>> c.subscribe(print)
+        >>> with c.batch():
+        ...     c.a = 'one'
+        ...     c.b = 'two'
+        [Change(path=('s', 'a'), ...), Change(path=('s', 'b'), ...)]
+        """
+        if not self._subscribers:
+            yield self
+            return
+
+        outer = self._pending is None
+        if outer:
+            self._pending = collections.OrderedDict()
+        try:
+            yield self
+        finally:
+            if outer:
+                pending, self._pending = self._pending, None
+                self._dispatch(list(pending.values()))
+
+    def _changed(self, change):
+        """Record `change` in the current batch, or deliver it immediately if there isn't one.
+
+        """
+        pending = self._pending
+        if pending is None:
+            self._dispatch([change])
+            return
+        previous = pending.get(change.path)
+        if previous is not None:
+            change = change._replace(old=previous.old)
+        pending[change.path] = change
+
+    def _dispatch(self, changes):
+        if not changes:
+            return
+        for prefix, callback in list(self._subscribers):
+            n = len(prefix)
+            matched = [change for change in changes if change.path[:n] == prefix]
+            if matched:
+                callback(matched)
+
+    def _field_set(self, field, old, new):
+        """Called by `Field.__set__` after writing to `self`, if there are subscribers.
+
+        """
+        self._changed(Change((field.store_attr,) + field._key_path, field, old, new))
+
+    @classmethod
+    def cached(cls, key, loader=None, sources=None):
+        """Get a shared, frozen instance of this class for `key`, only creating it if it isn't already cached.
+
+        Instances are held in the class's :py:attr:`__instance_cache__`.
+
+        Parameters
+        ----------
+        key : hashable
+            Key identifying the instance.
+        loader : callable, optional
+            Called with `key` to create the instance on a cache miss, must return a frozen instance. By default
+            `cls(key)` is used, i.e. `key` is passed to :py:meth:`Bonfig.load`.
+        sources : iterable of str, optional
+            Paths of files the instance is loaded from. If any change, the cached instance is discarded and reloaded.
+
+        Returns
+        -------
+        bonfig : Bonfig
+        """
+        cache = cls.__instance_cache__
+        if cache is None:
+            from bonfig.cache import InstanceCache
+
+            with _cache_lock:
+                cache = cls.__instance_cache__
+                if cache is None:
+                    cache = cls.__instance_cache__ = InstanceCache()
+        if loader is None:
+            loader = cls
+        return cache.get((cls, key), lambda: loader(key), sources)
@@ -7,12 +7,104 @@ fields : FieldDict
     default includes `Field`, `IntField`, `FloatField`, `BoolField` and `DatetimeField`.
 """
 
+import abc
+import base64
+import collections
+import concurrent.futures
 import functools
 import datetime
 import pathlib
+import re
+import sys
+import threading
+import time
+import weakref
+import zlib
 
+try:
+    import lzma
+except ImportError:
+    lzma = None
 
-class Store:
+
+def _intern(name):
+    """Intern `name` if it's a `str`, so that key lookups can short-circuit on identity.
+
+    """
+    if type(name) is str:
+        return sys.intern(name)
+    return name
+
+
+class _Missing:
+    """Sentinel type for values that are missing from a store.
+
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python < 3.7, scope to threads instead
+    class ContextVar:
+        """Minimal stand-in for `contextvars.ContextVar`, scoped to the current thread.
+
+        """
+
+        def __init__(self, name, default=None):
+            self.name = name
+            self._default = default
+            self._local = threading.local()
+
+        def get(self):
+            return getattr(self._local, 'value', self._default)
+
+        def set(self, value):
+            token = self.get()
+            self._local.value = value
+            return token
+
+        def reset(self, token):
+            self._local.value = token
+
+
+# Overrides active in the current context (see `Bonfig.override`), maps `(id(bonfig), field)` to `(bonfig, value)`,
+# or is `None` if there are none, so that reads only pay for a single check.
+_overrides = ContextVar('bonfig_overrides', default=None)
+
+
+class _FieldFactories(metaclass=abc.ABCMeta):
+    """
+    Mixin providing `Store.Field` -like attribute access for creating fields.
+
+    Factories are created once per field class and then shared between calls, rather than creating a new
+    `functools.partial` on every access.
+    """
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def _make_factory(self, field_cls):
+        """Create factory for `field_cls`, with this object's store or section bound.
+
+        """
+
+    def __getattr__(self, item):
+        if item.startswith('_') or item not in fields:
+            raise AttributeError(item)
+        field_cls = fields[item]
+        factory = self._factories.get(item)
+        if factory is None or factory.func is not field_cls:
+            factory = self._factories[item] = self._make_factory(field_cls)
+        return factory
+
+
+class Store(_FieldFactories):
     """
     Placeholder class, allowing structure of `store` to be created in `Bonfig`.
 
@@ -28,6 +120,11 @@ class Store:
         Name of attribute that child `Fields` will look for their values in i.e. the value :py:attr:`Field.store_attr`
         is set to for children. Default is to set to name that `Store` instance is assigned to
         (using `__set_name__` behaviour).
+    native_types : tuple of type, optional
+        Types the container can hold as they are, e.g. `(int, float, bool)` for `dict` s that are loaded from, or
+        dumped to, JSON or TOML. Fields whose :py:attr:`Field.native_type` is one of these store their values
+        natively, rather than as strings, so reading them is a plain lookup. By default, values are stored as
+        strings, as needed for INI files or environment variables.
 
     Examples
     --------
@@ -44,21 +141,31 @@ class Store:
     >>> Config.a.Field
     functools.partial(<class 'bonfig.fields.Field'>, _store=<Store: my store>)
     >>> Config.b.Section
-    functools.partial(<class 'bonfig.fields.Section'>, _store=<Store: b>)
+    <bound method Store.Section of <Store: b>>
     """
+    __slots__ = ('_name', '_with_owner', '_factories', 'native_types')
 
-    def __init__(self, _name=None):
-        self._name = _name
-        self.Section = functools.partial(Section, _store=self)
-
+    def __init__(self, _name=None, *, native_types=()):
+        self._name = _intern(_name)
         self._with_owner = None
+        self._factories = {}
+        self.native_types = tuple(native_types)
+
+    def _make_factory(self, field_cls):
+        return functools.partial(field_cls, _store=self)
+
+    def Section(self, name=None):
+        """Create a `Section` belonging to this store.
+
+        """
+        return Section(name, _store=self)
 
     @classmethod
     def _from_with(cls, with_owner):
         """Internal method for creating a 'proxy' of a :py:class:`Store` object for use in `with` blocks.
 
         """
-        o = cls(with_owner.name)
+        o = cls(with_owner.name, native_types=with_owner.native_types)
         o._with_owner = with_owner
         return o
 
@@ -81,12 +188,7 @@ class Store:
 
     def __set_name__(self, owner, name):
         if self._name is None:
-            self._name = name
-
-    def __getattr__(self, item):
-        if item in fields.keys():
-            return functools.partial(fields[item], _store=self)
-        raise AttributeError(item)
+            self._name = _intern(name)
 
     def __enter__(self):
         return self.__class__._from_with(self)
@@ -101,6 +203,81 @@ class Store:
             return "<Store: {} (with proxy of {})".format(self._name, self._with_owner)
 
 
+_FIXED_WIDTH_DIRECTIVES = {'%Y': (0, 4), '%y': (0, 2), '%m': (1, 2), '%d': (2, 2),
+                           '%H': (3, 2), '%M': (4, 2), '%S': (5, 2)}
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_datetime_fmt(fmt):
+    """Compile `fmt` into a function that parses datetime strings of that format.
+
+    If `fmt` only contains fixed-width numerical directives (see `_FIXED_WIDTH_DIRECTIVES`) and literal characters, the
+    returned function parses strings using a pre-compiled regex, which is much faster than `strptime`. Strings that
+    don't match the regex, and any other formats, fall back to `datetime.datetime.strptime`, such that the result is
+    always the same as `strptime`.
+    """
+    strptime = datetime.datetime.strptime
+
+    def slow(val):
+        return strptime(val, fmt)
+
+    pattern, positions, short_year = [], [], False
+    for token in re.split('(%.)', fmt):
+        if token.startswith('%') and len(token) == 2:
+            if token not in _FIXED_WIDTH_DIRECTIVES:
+                return slow
+            position, width = _FIXED_WIDTH_DIRECTIVES[token]
+            if position in positions:
+                return slow
+            positions.append(position)
+            short_year = short_year or token == '%y'
+            pattern.append('([0-9]{{{}}})'.format(width))
+        elif token:
+            pattern.append(re.escape(token))
+
+    if not positions:
+        return slow
+
+    match = re.compile(''.join(pattern)).fullmatch
+    defaults = (1900, 1, 1, 0, 0, 0)
+    order = tuple(positions)
+    year_group = order.index(0) if short_year else None
+
+    def fast(val):
+        m = match(val)
+        if m is None:
+            return strptime(val, fmt)
+        args = list(defaults)
+        for position, digits in zip(order, m.groups()):
+            args[position] = int(digits)
+        if year_group is not None:
+            args[0] += 2000 if args[0] < 69 else 1900  # same pivot as strptime
+        try:
+            return datetime.datetime(*args)
+        except ValueError:
+            return strptime(val, fmt)  # for strptime's error message
+
+    return fast
+
+
+if hasattr(datetime.datetime, 'fromisoformat'):
+    _parse_iso_datetime = datetime.datetime.fromisoformat
+else:  # Python < 3.7
+    _parse_iso_datetime = _compile_datetime_fmt('%Y-%m-%dT%H:%M:%S')
+
+
+def _instance_cache(bonfig):
+    """Get `dict` that fields can use to cache values for `bonfig`.
+
+    Entries should be keyed by `Field` (or a `tuple` starting with one), and be validated against the raw value in the
+    store before use, as stores can be replaced (e.g. by :py:meth:`Bonfig.edit`).
+    """
+    try:
+        return bonfig.__dict__['_field_cache']
+    except KeyError:  # another thread may be creating it too, setdefault makes sure only one dict is ever used
+        return bonfig.__dict__.setdefault('_field_cache', {})
+
+
 def str_bool(t):
     return t != 'False'
 
@@ -148,7 +325,7 @@ def make_sub_field(name, bases, post_get=None, pre_set=None, doc=None):
     if doc is None:
         doc = name
 
-    cls = type(name, (bases,), {})
+    cls = type(name, (bases,), {'__slots__': ()})
     cls._post_get = lambda s, v: post_get(v)
     cls._post_get.__doc__ = post_get.__doc__
     cls._pre_set = lambda s, v: pre_set(v)
@@ -256,6 +433,13 @@ class Field:
     name : str, optional
         Key that is used to get value of `Field` as stored in `store`. Default behaviour is to take the name of the
         class attribute `Field` was set to (using `__set_name__`).
+    default_factory : callable, optional
+        Called with no arguments to create the fallback value the first time this parameter isn't found in `store`,
+        instead of using `default`. The result is returned as-is, i.e. without being de-serialised, so can be of any
+        type, including `None`.
+    memoise : {'instance', 'class'}, optional
+        Whether the result of `default_factory` is kept per `Bonfig` instance (the default), or shared by every
+        instance.
     _store : Store
         `store` that this `Field` belongs to/ looks into. Shouldn't really be set directly, instead use `Store.Field` to
         create `Field` instances.
@@ -324,21 +508,39 @@ class Field:
     "GarryLineker"
     """
 
-    def __init__(self, val=None, default=None, name=None, *, _store=None, _section=None):
+    native_type = None
+    """Type values can be stored as, instead of `str`, in stores that support it (see `Store`), or `None`."""
+
+    __slots__ = ('val', 'name', 'default', 'default_factory', 'memoise', 'store', 'section', '_path', '_factory_value',
+                 '_native')
+
+    def __init__(self, val=None, default=None, name=None, *, default_factory=None, memoise='instance', _store=None,
+                 _section=None):
         self.val = val
-        self.name = name
+        self.name = _intern(name)
         self.default = default
 
+        if default is not None and default_factory is not None:
+            raise ValueError("Only one of default and default_factory can be given")
+        if memoise not in ('instance', 'class'):
+            raise ValueError("memoise must be 'instance' or 'class', not {!r}".format(memoise))
+        self.default_factory = default_factory
+        self.memoise = memoise
+        self._factory_value = MISSING
+
         if _store is None:
             raise ValueError("Parameter store cannot be None")
 
         self.store = _store
+        self._native = self.native_type if self.native_type in getattr(_store, 'native_types', ()) else None
 
         self.section = _section
+        self._path = None
 
     def __set_name__(self, owner, name):
         if self.name is None:
-            self.name = name
+            self.name = _intern(name)
+            self._path = None
 
     @property
     def store_attr(self):
@@ -362,6 +564,16 @@ class Field:
             return self.section.keys + [self.name]
         return [self.name]
 
+    @property
+    def _key_path(self):
+        """Interned `tuple` version of `keys`, computed once and then reused for every lookup.
+
+        """
+        path = self._path
+        if path is None:
+            path = self._path = tuple(_intern(key) for key in self.keys)
+        return path
+
     def _initialise(self, bonfig):
         """Initialise `Field`.
 
@@ -378,9 +590,9 @@ class Field:
             return  # skip
 
         dd = self._get_store(bonfig)
-        dtype = dd.__class__
+        dtype = getattr(dd, 'section_type', dd.__class__)
         d = dd
-        for key in self.keys[:-1]:
+        for key in self._key_path[:-1]:
             try:
                 d = d[key]
             except KeyError:
@@ -397,14 +609,15 @@ class Field:
         Hook to allow you to control how the value is looked up in the data Store.
         """
         try:
-            return _dict_keys_get(store, self.keys)
+            return _dict_keys_get(store, self._key_path)
         except KeyError as e:
             if self.default is not None:
                 return self.default
             raise e
 
     def _set_value(self, store, value):
-        _dict_keys_get(store, self.keys[:-1])[self.name] = value
+        path = self._key_path
+        _dict_keys_get(store, path[:-1])[path[-1]] = value
 
     def _pre_set(self, val):
         """
@@ -421,12 +634,82 @@ class Field:
     def __get__(self, bonfig, owner):
         if bonfig is None:
             return self
+        overrides = _overrides.get()
+        if overrides is not None:
+            override = overrides.get((id(bonfig), self))
+            if override is not None:
+                return override[1]
         store = self._get_store(bonfig)
-        return self._post_get(self._get_value(store))
+        try:
+            raw = self._get_value(store)
+        except KeyError:
+            if self.default_factory is None:
+                raise
+            return self._factory_default(bonfig)
+        if type(raw) is self._native:
+            return raw
+        return self._post_get(raw)
+
+    def _factory_default(self, bonfig):
+        """Get the value of `default_factory`, calling it if there isn't already a memoised value for `bonfig`.
+
+        If `bonfig` is `None`, a new value is created each time when memoising per instance.
+        """
+        if self.memoise == 'class':
+            value = self._factory_value
+            if value is MISSING:
+                value = self._factory_value = self.default_factory()
+            return value
+
+        if bonfig is None:
+            return self.default_factory()
+        cache = _instance_cache(bonfig)
+        key = (self, MISSING)
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = self.default_factory()
+            return value
+
+    def _get_in_section(self, bonfig, container):
+        """As `__get__`, but looking up the value directly in `container`, the already resolved section it belongs to.
+
+        Used by :py:class:`SectionView`, only for fields that don't override `__get__` or `_get_value`. If `container` is
+        `None`, i.e. the section is missing, falls back to `__get__`, so defaults apply as usual.
+        """
+        if container is None:
+            return self.__get__(bonfig, bonfig.__class__)
+        overrides = _overrides.get()
+        if overrides is not None:
+            override = overrides.get((id(bonfig), self))
+            if override is not None:
+                return override[1]
+        try:
+            raw = container[self._key_path[-1]]
+        except KeyError:
+            if self.default is not None:
+                raw = self.default
+            elif self.default_factory is not None:
+                return self._factory_default(bonfig)
+            else:
+                raise
+        if type(raw) is self._native:
+            return raw
+        return self._post_get(raw)
 
     def __set__(self, bonfig, value):
         store = self._get_store(bonfig)
-        self._set_value(store, self._pre_set(value))
+        value = self._pre_set(value)
+        if not bonfig._subscribers:
+            self._set_value(store, value)
+            return
+
+        try:
+            old = _dict_keys_get(store, self._key_path)
+        except KeyError:
+            old = MISSING
+        self._set_value(store, value)
+        bonfig._field_set(self, old, value)
 
     def __repr__(self):
         return "<{} '{}' stored in {}: val={}, default={}>".format(self.__class__.__name__,
@@ -456,6 +739,7 @@ class Field:
         if isinstance(other, Field):
             other = other.val
         return self.__class__(self.val + other, default=self.default, name=self.name,
+                              default_factory=self.default_factory, memoise=self.memoise,
                               _store=self.store, _section=self.section)
 
 
@@ -467,7 +751,7 @@ class IntField(Field):
     """
     Field that serialises and de-serialises values as integers.
 
-    Values are stored as strings within `store`
+    Values are stored as strings within `store`, unless it holds `int` s natively (see `Store`).
 
     Parameters
     ----------
@@ -491,8 +775,13 @@ class IntField(Field):
     --------
     Field : Parent class
     """
+    __slots__ = ()
+
+    native_type = int
 
     def _pre_set(self, val):
+        if self._native is not None:
+            return int(val)
         return str(val)
 
     def _post_get(self, val):
@@ -504,7 +793,7 @@ class FloatField(Field):
     """
     Field that serialises and de-serialises values as floats.
 
-    Values are stored as strings within `store`
+    Values are stored as strings within `store`, unless it holds `float` s natively (see `Store`).
 
     Parameters
     ----------
@@ -528,8 +817,13 @@ class FloatField(Field):
     --------
     Field : Parent class
     """
+    __slots__ = ()
+
+    native_type = float
 
     def _pre_set(self, val):
+        if self._native is not None:
+            return float(val)
         return str(val)
 
     def _post_get(self, val):
@@ -541,7 +835,7 @@ class BoolField(Field):
     """
     Field that serialises and de-serialises values as Booleans.
 
-    Values are stored as strings within `store`
+    Values are stored as strings within `store`, unless it holds `bool` s natively (see `Store`).
 
     Parameters
     ----------
@@ -565,11 +859,18 @@ class BoolField(Field):
     --------
     Field : Parent class
     """
+    __slots__ = ()
+
+    native_type = bool
 
     def _pre_set(self, val):
+        if self._native is not None:
+            return val == 'True' if isinstance(val, str) else bool(val)
         return str(val)
 
     def _post_get(self, val):
+        if type(val) is bool:
+            return val
         return val == 'True'
 
 
@@ -605,22 +906,79 @@ class DatetimeField(Field):
     --------
     Field : Parent class
     """
+    __slots__ = ('fmt', '_parse')
 
-    def __init__(self, val=None, default=None, name=None, fmt=None, *, _store=None, _section=None):
+    def __init__(self, val=None, default=None, name=None, fmt=None, *, default_factory=None, memoise='instance',
+                 _store=None, _section=None):
         if fmt is None:
             raise ValueError("fmt can't be None")
         self.fmt = fmt
+        self._parse = _compile_datetime_fmt(fmt)
 
         if isinstance(val, str):
-            val = datetime.datetime.strptime(val, fmt)
+            val = self._parse(val)
 
-        super().__init__(val, default, name, _store=_store, _section=_section)
+        super().__init__(val, default, name, default_factory=default_factory, memoise=memoise, _store=_store,
+                         _section=_section)
 
     def _pre_set(self, val):
         return val.strftime(self.fmt)
 
     def _post_get(self, val):
-        return datetime.datetime.strptime(val, self.fmt)
+        """
+        Parse `val` using `fmt`.
+
+        Fixed-width numerical formats, such as `'%d/%m/%Y'` or `'%Y-%m-%dT%H:%M:%S'`, are parsed with a pre-compiled
+        parser, any others use `datetime.datetime.strptime`.
+        """
+        return self._parse(val)
+
+
+@fields.add
+class IsoDatetimeField(Field):
+    """
+    Field that serialises and de-serialises datetimes as ISO 8601 strings.
+
+    Values are stored as strings within `store`, using `datetime.isoformat` and parsed using the much faster
+    `datetime.datetime.fromisoformat`, rather than `strptime`.
+
+    Parameters
+    ----------
+    val : str, datetime.datetime
+        Either str or datetime, if str will be automatically converted to datetime.
+    default, name, _store, _section : object
+        See :py:class:`Field`
+
+    Examples
+    --------
+    >>> class Config(Bonfig):
+    ...     s = Store()
+    ...     when = s.IsoDatetimeField('1995-12-25T09:30:00')
+    ...
+    >>> c = Config()
+    >>> c.when
+    datetime.datetime(1995, 12, 25, 9, 30)
+    >>> c.s
+    {'when': '1995-12-25T09:30:00'}
+
+    See Also
+    --------
+    Field : Parent class
+    """
+    __slots__ = ()
+
+    def __init__(self, val=None, default=None, name=None, *, default_factory=None, memoise='instance', _store=None,
+                 _section=None):
+        if isinstance(val, str):
+            val = _parse_iso_datetime(val)
+        super().__init__(val, default, name, default_factory=default_factory, memoise=memoise, _store=_store,
+                         _section=_section)
+
+    def _pre_set(self, val):
+        return val.isoformat()
+
+    def _post_get(self, val):
+        return _parse_iso_datetime(val)
         
         
 @fields.add
@@ -656,11 +1014,14 @@ class PathField(Field):
     --------
     Field : Parent class
     """
-    
-    def __init__(self, val=None, default=None, name=None, *, _store=None, _section=None):
+    __slots__ = ()
+
+    def __init__(self, val=None, default=None, name=None, *, default_factory=None, memoise='instance', _store=None,
+                 _section=None):
         if val is not None:
             val = pathlib.Path(val)
-        super().__init__(val, default, name, _store=_store, _section=_section)
+        super().__init__(val, default, name, default_factory=default_factory, memoise=memoise, _store=_store,
+                         _section=_section)
     
     def _pre_set(self, val):
         return val.as_posix()
@@ -689,10 +1050,288 @@ class PathField(Field):
         """
         if isinstance(other, PathField):
             other = other.val
-        return self.__class__(self.val / other, default=self.default, name=self.name, _store=self.store, _section=self.section)
+        return self.__class__(self.val / other, default=self.default, name=self.name,
+                              default_factory=self.default_factory, memoise=self.memoise,
+                              _store=self.store, _section=self.section)
+
+
+class _SecretEntry:
+    """Cached decrypted value of a `SecretField`, which hides the value from `repr`.
+
+    """
+    __slots__ = ('raw', 'value', 'expires')
+
+    def __init__(self, raw, value, expires):
+        self.raw = raw
+        self.value = value
+        self.expires = expires
+
+    def __repr__(self):
+        return "<secret>"
+
+
+@fields.add
+class SecretField(Field):
+    """
+    Field for encrypted values, which are decrypted when first read, then cached per `Bonfig` instance.
+
+    Values are stored encrypted within `store`, and whatever is written to the field is stored as-is, i.e. it should
+    already be encrypted. Decrypted values are never written to the store, and are hidden from `repr`.
+
+    Parameters
+    ----------
+    decryptor : callable
+        Required keyword argument - function that takes the stored (encrypted) value and returns it decrypted. If it
+        returns a `bytearray`, :py:meth:`SecretField.wipe` will overwrite it with zeros.
+    ttl : float, optional
+        Seconds to keep decrypted values cached for. By default they're kept until wiped.
+    val, default, name, _store, _section : object
+        See :py:class:`Field`
+
+    Examples
+    --------
+    >>> class Config(Bonfig):
+    ...     s = Store()
+    ...     password = s.SecretField(decryptor=kms_decrypt, ttl=3600)
+    ...
+    ...     def load(self):
+    ...         self.s = json.load(open('config.json'))
+    >>> c = Config()
+    >>> decrypt_secrets(c)  # decrypt all secrets concurrently, e.g. at startup
+    >>> c.password
+    'hunter2'
+
+    See Also
+    --------
+    decrypt_secrets : decrypt all of the secrets of a `Bonfig` in a thread pool.
+    Field : Parent class
+    """
+    __slots__ = ('decryptor', 'ttl')
+
+    def __init__(self, val=None, default=None, name=None, *, decryptor=None, ttl=None, default_factory=None,
+                 memoise='instance', _store=None, _section=None):
+        if decryptor is None:
+            raise ValueError("decryptor can't be None")
+        self.decryptor = decryptor
+        self.ttl = ttl
+        super().__init__(val, default, name, default_factory=default_factory, memoise=memoise, _store=_store,
+                         _section=_section)
+
+    def __get__(self, bonfig, owner):
+        if bonfig is None:
+            return self
+        overrides = _overrides.get()
+        if overrides is not None:
+            override = overrides.get((id(bonfig), self))
+            if override is not None:
+                return override[1]
+        try:
+            raw = self._get_value(self._get_store(bonfig))
+        except KeyError:
+            if self.default_factory is None:
+                raise
+            return self._factory_default(bonfig)
+
+        cache = _instance_cache(bonfig)
+        entry = cache.get(self)
+        if entry is not None and entry.raw == raw and (entry.expires is None or time.monotonic() < entry.expires):
+            return entry.value
+
+        value = self.decryptor(raw)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        cache[self] = _SecretEntry(raw, value, expires)
+        return value
+
+    def wipe(self, bonfig):
+        """Remove the decrypted value cached for `bonfig`, overwriting it first if it's a `bytearray`.
+
+        """
+        entry = _instance_cache(bonfig).pop(self, None)
+        if entry is not None and isinstance(entry.value, bytearray):
+            entry.value[:] = bytes(len(entry.value))
+
+    def __add__(self, other):
+        raise TypeError("SecretFields can't be added to")
+
+    def __repr__(self):
+        return "<{} '{}' stored in {}>".format(self.__class__.__name__, self.name, self.store_attr)
+
+
+def _secret_fields(bonfig):
+    return [field for field in bonfig.__fields__ if isinstance(field, SecretField)]
+
+
+def decrypt_secrets(bonfig, executor=None, max_workers=None):
+    """Decrypt every `SecretField` of `bonfig` concurrently, caching the results.
+
+    Parameters
+    ----------
+    bonfig : Bonfig
+    executor : concurrent.futures.Executor, optional
+        Executor to run decryptors with. By default a new `ThreadPoolExecutor` is used.
+    max_workers : int, optional
+        `max_workers` of the default executor.
+    """
+    secrets = _secret_fields(bonfig)
+    if executor is None:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return decrypt_secrets(bonfig, executor)
+    futures = [executor.submit(field.__get__, bonfig, bonfig.__class__) for field in secrets]
+    for future in futures:
+        future.result()
+
+
+def wipe_secrets(bonfig):
+    """Wipe the cached decrypted values of every `SecretField` of `bonfig`.
+
+    """
+    for field in _secret_fields(bonfig):
+        field.wipe(bonfig)
+
+
+@fields.add
+class BlobField(Field):
+    """
+    Field for large binary values, stored compressed and base64 encoded.
+
+    Values are decoded the first time they're read, and for frozen `Bonfig` s, the decoded buffer is cached per
+    instance. Reads return a read-only `memoryview` of the cached buffer, so slicing it doesn't copy.
+
+    Parameters
+    ----------
+    compression : {'zlib', 'lzma', None}, optional
+        How values are compressed before being base64 encoded, `'zlib'` by default.
+    budget : int, optional
+        Maximum number of bytes of decoded buffers to keep cached, across all instances. When exceeded, the least
+        recently read buffers are released, and decoded again when next read. By default, there's no limit.
+    val, default, name, _store, _section : object
+        See :py:class:`Field`
+
+    Examples
+    --------
+    >>> class Config(Bonfig):
+    ...     s = Store()
+    ...     certs = s.BlobField(compression='lzma', budget=64 * 2 ** 20)
+    ...
+    ...     def load(self):
+    ...         self.s = json.load(open('config.json'))
+    >>> c = Config()
+    >>> c.certs[:27].tobytes()
+    b'-----BEGIN CERTIFICATE-----'
+
+    See Also
+    --------
+    Field : Parent class
+    """
+    __slots__ = ('compression', 'budget', '_compress', '_decompress', '_lru', '_nbytes', '_lock')
+
+    def __init__(self, val=None, default=None, name=None, *, compression='zlib', budget=None, default_factory=None,
+                 memoise='instance', _store=None, _section=None):
+        if compression == 'zlib':
+            self._compress, self._decompress = zlib.compress, zlib.decompress
+        elif compression == 'lzma':
+            if lzma is None:
+                raise ValueError("lzma compression isn't available")
+            self._compress, self._decompress = lzma.compress, lzma.decompress
+        elif compression is None:
+            self._compress = self._decompress = None
+        else:
+            raise ValueError("compression must be 'zlib', 'lzma' or None, not {!r}".format(compression))
+        self.compression = compression
+        self.budget = budget
+        self._lru = collections.OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        super().__init__(val, default, name, default_factory=default_factory, memoise=memoise, _store=_store,
+                         _section=_section)
+
+    def _pre_set(self, val):
+        data = bytes(val)
+        if self._compress is not None:
+            data = self._compress(data)
+        return base64.b64encode(data).decode('ascii')
+
+    def _post_get(self, val):
+        data = base64.b64decode(val)
+        if self._decompress is not None:
+            data = self._decompress(data)
+        return memoryview(data)
+
+    def __get__(self, bonfig, owner):
+        if bonfig is None:
+            return self
+        overrides = _overrides.get()
+        if overrides is not None:
+            override = overrides.get((id(bonfig), self))
+            if override is not None:
+                return override[1]
+        try:
+            raw = self._get_value(self._get_store(bonfig))
+        except KeyError:
+            if self.default_factory is None:
+                raise
+            return self._factory_default(bonfig)
+
+        if not bonfig._frozen:
+            return self._post_get(raw)
+
+        cache = _instance_cache(bonfig)
+        entry = cache.get(self)
+        if entry is not None and (entry[0] is raw or entry[0] == raw):
+            if self.budget is not None:
+                with self._lock:
+                    if id(bonfig) in self._lru:
+                        self._lru.move_to_end(id(bonfig))
+            return entry[1]
+
+        value = self._post_get(raw)
+        cache[self] = (raw, value)
+        if self.budget is not None:
+            self._account(bonfig, value.nbytes)
+        return value
+
+    def _account(self, bonfig, nbytes):
+        """Record `nbytes` cached for `bonfig`, then release the least recently read buffers until within budget.
+
+        """
+        key = id(bonfig)
+        with self._lock:
+            previous = self._lru.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous[1]
+            self._lru[key] = (weakref.ref(bonfig, lambda _: self._forget(key)), nbytes)
+            self._nbytes += nbytes
+
+            while self._nbytes > self.budget and len(self._lru) > 1:
+                _, (ref, size) = self._lru.popitem(last=False)
+                self._nbytes -= size
+                evicted = ref()
+                if evicted is not None:
+                    _instance_cache(evicted).pop(self, None)
+
+    def _forget(self, key):
+        with self._lock:
+            entry = self._lru.pop(key, None)
+            if entry is not None:
+                self._nbytes -= entry[1]
+
+    @property
+    def nbytes(self):
+        """Number of bytes of decoded buffers currently counted against `budget`.
+
+        """
+        return self._nbytes
 
+    def release(self, bonfig):
+        """Release the decoded buffer cached for `bonfig`.
 
-class Section:
+        """
+        _instance_cache(bonfig).pop(self, None)
+        if self.budget is not None:
+            self._forget(id(bonfig))
+
+
+class Section(_FieldFactories):
     """
     Convenience class for building up multi-level `Bonfigs` s.
 
@@ -746,8 +1385,10 @@ class Section:
     }
     """
 
+    __slots__ = ('_name', 'supsection', 'store', '_with_owner', '_factories', '_path')
+
     def __init__(self, name=None, *, _supsection=None, _store=None):
-        self._name = name
+        self._name = _intern(name)
 
         self.supsection = _supsection
         if _store is None:
@@ -756,8 +1397,17 @@ class Section:
         self.store = _store
 
         self._with_owner = None
+        self._factories = {}
+        self._path = None
 
-        self.Section = functools.partial(Section, _store=_store, _supsection=self)
+    def _make_factory(self, field_cls):
+        return functools.partial(field_cls, _section=self, _store=self.store)
+
+    def Section(self, name=None):
+        """Create a `Section` nested within this section.
+
+        """
+        return Section(name, _store=self.store, _supsection=self)
 
     @classmethod
     def _from_with(cls, with_owner):
@@ -779,7 +1429,8 @@ class Section:
 
     def __set_name__(self, owner, name):
         if self._name is None:
-            self._name = name
+            self._name = _intern(name)
+            self._path = None
 
     @property
     def name(self):
@@ -800,10 +1451,20 @@ class Section:
         else:
             return [self.name]
 
-    def __getattr__(self, item):
-        if item in fields.keys():
-            return functools.partial(fields[item], _section=self, _store=self.store)
-        raise AttributeError(item)
+    @property
+    def _key_path(self):
+        """Interned `tuple` version of `keys`, computed once and then reused.
+
+        """
+        path = self._path
+        if path is None:
+            path = self._path = tuple(_intern(key) for key in self.keys)
+        return path
+
+    def __get__(self, bonfig, owner):
+        if bonfig is None:
+            return self
+        return SectionView(self, bonfig)
 
     def __enter__(self):
         return self.__class__._from_with(self)
@@ -816,3 +1477,127 @@ class Section:
             return "<Section: {}>".format(self.keys)
         else:
             return "<Section: {} (with proxy called {})>".format(self.keys, self._name)
+
+
+_members_cache = weakref.WeakKeyDictionary()
+
+
+def _section_members(cls):
+    """Map `(store_attr, section key path)` to a `dict` of attribute names to the `Field` s and `Section` s of `cls`
+    directly within that section.
+
+    Fields are mapped to `(field, fast)`, where `fast` is `True` if the field can be read using
+    `Field._get_in_section`, and sections to `(section, None)`.
+    """
+    try:
+        return _members_cache[cls]
+    except KeyError:
+        pass
+
+    members = {}
+    for attr_name in dir(cls):
+        attr = getattr(cls, attr_name)
+        if isinstance(attr, Field) and attr.section is not None:
+            fast = type(attr).__get__ is Field.__get__ and type(attr)._get_value is Field._get_value
+            members.setdefault((attr.store_attr, attr.section._key_path), {})[attr_name] = (attr, fast)
+        elif isinstance(attr, Section) and attr.supsection is not None:
+            members.setdefault((attr.store.name, attr.supsection._key_path), {})[attr_name] = (attr, None)
+    _members_cache[cls] = members
+    return members
+
+
+class SectionView:
+    """
+    View of a `Section` bound to a `Bonfig` instance, returned when a section is accessed from an instance.
+
+    The container the section refers to within the store is looked up once, the first time it's needed, then reused
+    for every field read through the view, so reading many fields of a deeply nested section only walks the keys
+    leading to it once. Sub-sections accessed through a view start from the container of their parent.
+
+    Attributes of the underlying `Section`, such as `keys` and `name`, are also available.
+
+    Examples
+    --------
+    >>> class Config(Bonfig):
+    ...     s = Store()
+    ...     A = s.Section()
+    ...     a = A.Field('one')
+    ...     b = A.IntField(2)
+    ...
+    >>> c = Config()
+    >>> c.A.a
+    'one'
+    >>> list(c.A)
+    ['a', 'b']
+    >>> c.A.read()
+    {'a': 'one', 'b': 2}
+    """
+    __slots__ = ('section', '_bonfig', '_store', '_container', '_members')
+
+    def __init__(self, section, bonfig, _store=None, _container=None):
+        self.section = section
+        self._bonfig = bonfig
+        self._store = _store
+        self._container = _container
+        self._members = _section_members(bonfig.__class__).get((section.store.name, section._key_path), {})
+
+    def _resolve(self):
+        """Get container this view refers to, looking it up again only if the store has been replaced.
+
+        Returns `None` if the section is missing from the store.
+        """
+        store = getattr(self._bonfig, self.section.store.name)
+        if store is not self._store or self._container is None:
+            try:
+                self._container = _dict_keys_get(store, self.section._key_path)
+            except (KeyError, TypeError):
+                self._container = None
+            self._store = store
+        return self._container
+
+    def __getattr__(self, name):
+        try:
+            member, fast = self._members[name]
+        except KeyError:
+            return getattr(self.section, name)
+
+        if fast is None:
+            container = self._subcontainer(member)
+            return SectionView(member, self._bonfig, self._store, container)
+        if fast:
+            return member._get_in_section(self._bonfig, self._resolve())
+        return member.__get__(self._bonfig, self._bonfig.__class__)
+
+    def _subcontainer(self, section):
+        try:
+            return self._resolve()[section.name]
+        except (KeyError, TypeError):
+            return None
+
+    def __iter__(self):
+        """Iterate over the attribute names of the fields in this section.
+
+        """
+        return (name for name, (_, fast) in sorted(self._members.items()) if fast is not None)
+
+    def read(self, *names):
+        """Read several fields at once, returning a `dict` of attribute names to values.
+
+        Parameters
+        ----------
+        *names : str
+            Attribute names of the fields to read, by default all fields in this section.
+        """
+        return {name: getattr(self, name) for name in (names or self)}
+
+    def fingerprint(self):
+        """Fingerprint of the values in this section, see :py:meth:`Bonfig.fingerprint`.
+
+        """
+        return self._bonfig.fingerprint(self.section)
+
+    def __dir__(self):
+        return sorted(set(object.__dir__(self)) | set(self._members))
+
+    def __repr__(self):
+        return "<SectionView: {} of {}>".format(self.section.keys, self._bonfig.__class__.__name__)
@@ -0,0 +1,67 @@
+"""
+Preparing frozen `Bonfig` s for pre-fork servers.
+
+After a fork, child processes share their parent's memory pages until they're written to. Reading a config still
+writes to memory though: reference counts are updated on every access, and the cyclic garbage collector writes to
+the header of every tracked container (such as the `dict` s behind frozen stores) each time it runs. Over time, this
+causes each child to end up with its own copy of pages holding config objects.
+
+:py:func:`prepare_fork` limits this by laying frozen stores out compactly, so that the objects they're made of
+occupy as few pages as possible, then moving them out of reach of the garbage collector using `gc.freeze`.
+"""
+
+import gc
+import sys
+import types
+
+from bonfig.stores import BaseStore
+
+
+def _compact(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, types.MappingProxyType):
+        return types.MappingProxyType({_compact(k): _compact(v) for k, v in value.items()})
+    return value
+
+
+def compact(bonfig):
+    """Re-create the frozen stores of `bonfig` so that their objects are allocated together.
+
+    Only stores that are nested `MappingProxyType` s, as produced by :py:meth:`Bonfig.freeze`, are re-created, other
+    stores, such as :py:class:`bonfig.stores.BaseStore` s, are left alone. String keys and values are interned, so
+    equal strings are shared between stores and instances.
+    """
+    if not bonfig._frozen:
+        raise ValueError("Only frozen Bonfigs can be compacted")
+    for store_attr in bonfig.__store_attrs__:
+        store = getattr(bonfig, store_attr)
+        if isinstance(store, types.MappingProxyType) and not isinstance(store, BaseStore):
+            setattr(bonfig, store_attr, _compact(store))
+
+
+def prepare_fork(*bonfigs):
+    """Prepare frozen `bonfigs` to be shared with child processes. Call this just before forking workers.
+
+    Each of `bonfigs` is compacted (see :py:func:`compact`), then a full collection is run and, on Python 3.7+, all
+    objects that currently exist are moved into the garbage collector's permanent generation using `gc.freeze`, so
+    that collections in the children no longer touch them.
+
+    Notes
+    -----
+    `gc.freeze` applies to every object in the process, not just config objects, so anything alive at this point will
+    never be collected. Use `gc.unfreeze` to undo this.
+
+    Returns
+    -------
+    frozen : int
+        Number of objects in the permanent generation, or `0` if `gc.freeze` isn't available.
+    """
+    for bonfig in bonfigs:
+        compact(bonfig)
+
+    gc.collect()
+    if not hasattr(gc, 'freeze'):  # Python < 3.7
+        return 0
+    gc.freeze()
+    return gc.get_freeze_count()
@@ -0,0 +1,345 @@
+"""
+Columnar view over many instances of a `Bonfig` class, for filtering, sorting and aggregating them quickly.
+
+Columns are NumPy arrays if NumPy is installed, otherwise `array.array` s (for `IntField`, `FloatField` and
+`BoolField` s) or `list` s.
+"""
+
+import array
+import operator
+
+from bonfig.core import _field_attrs, _is_mapping
+from bonfig.fields import IntField, FloatField, BoolField
+from bonfig.stores import BaseStore
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+_TYPECODES = ((BoolField, 'b'), (IntField, 'q'), (FloatField, 'd'))
+
+if numpy is not None:
+    _DTYPES = {'b': numpy.bool_, 'q': numpy.int64, 'd': numpy.float64}
+
+
+def _make_column(values, field):
+    """Turn list `values` into the most compact column type available for `field`.
+
+    """
+    typecode = None
+    for field_cls, code in _TYPECODES:
+        if isinstance(field, field_cls):
+            typecode = code
+            break
+
+    if typecode is not None and None not in values:
+        if numpy is not None:
+            return numpy.array(values, dtype=_DTYPES[typecode])
+        return array.array(typecode, values)
+
+    if numpy is not None:
+        column = numpy.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+    return values
+
+
+def _take(data, indices):
+    if numpy is not None:
+        return data[numpy.asarray(indices, dtype=numpy.intp)]
+    if isinstance(data, array.array):
+        return array.array(data.typecode, (data[i] for i in indices))
+    return [data[i] for i in indices]
+
+
+class Mask:
+    """
+    Boolean mask over the rows of a :py:class:`ConfigFrame`, produced by comparing a :py:class:`Column`.
+
+    Combine masks with ``&``, ``|`` and ``~``, then select rows with ``frame[mask]``.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def _combine(self, other, op):
+        other = other.data if isinstance(other, Mask) else other
+        if numpy is not None:
+            return Mask(op(self.data, numpy.asarray(other, dtype=bool)))
+        return Mask([op(a, b) for a, b in zip(self.data, other)])
+
+    def __and__(self, other):
+        return self._combine(other, operator.and_)
+
+    def __or__(self, other):
+        return self._combine(other, operator.or_)
+
+    def __invert__(self):
+        if numpy is not None:
+            return Mask(~self.data)
+        return Mask([not v for v in self.data])
+
+    def indices(self):
+        """Indices of rows where the mask is `True`.
+
+        """
+        if numpy is not None:
+            return numpy.flatnonzero(self.data)
+        return [i for i, v in enumerate(self.data) if v]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data)
+
+
+class Column:
+    """
+    Values of one field across every row of a :py:class:`ConfigFrame`.
+
+    Comparison operators are vectorised, returning a :py:class:`Mask`.
+    """
+    __slots__ = ('name', 'data')
+
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+
+    def _compare(self, other, op):
+        if numpy is not None:
+            if self.data.dtype != object:
+                return Mask(numpy.asarray(op(self.data, other), dtype=bool))
+            # missing values never match, as None can't be ordered against other values
+            present = numpy.array([v is not None for v in self.data], dtype=bool)
+            result = numpy.zeros(len(self.data), dtype=bool)
+            result[present] = numpy.asarray(op(self.data[present], other), dtype=bool)
+            return Mask(result)
+        return Mask([v is not None and op(v, other) for v in self.data])
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._compare(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    __hash__ = None
+
+    def isin(self, values):
+        """Mask of rows whose value is in `values`.
+
+        """
+        values = set(values)
+        return Mask([v in values for v in self.data]) if numpy is None else \
+            Mask(numpy.array([v in values for v in self.data], dtype=bool))
+
+    def _present(self):
+        return [v for v in self.data if v is not None]
+
+    def sum(self):
+        return self.data.sum() if numpy is not None and self.data.dtype != object else sum(self._present())
+
+    def min(self):
+        return self.data.min() if numpy is not None and self.data.dtype != object else min(self._present())
+
+    def max(self):
+        return self.data.max() if numpy is not None and self.data.dtype != object else max(self._present())
+
+    def mean(self):
+        if numpy is not None and self.data.dtype != object:
+            return self.data.mean()
+        present = self._present()
+        return sum(present) / len(present)
+
+    def unique(self):
+        """Distinct values of column, in order of first appearance.
+
+        """
+        seen = {}
+        for v in self.data:
+            seen.setdefault(v, None)
+        return list(seen)
+
+    def tolist(self):
+        return list(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __getitem__(self, i):
+        return self.data[i]
+
+    def __repr__(self):
+        return "<Column {!r}: {} rows>".format(self.name, len(self))
+
+
+def _copy_store(store):
+    """Copy `store`, and each section within it, into new `dict` s. Instances of
+    :py:class:`bonfig.stores.BaseStore` aren't copied.
+
+    """
+    if isinstance(store, BaseStore) or not _is_mapping(store):
+        return store
+    return {key: _copy_store(store[key]) for key in store.keys()}
+
+
+def _read_stores(field, stores):
+    try:
+        return field._post_get(field._get_value(stores[field.store_attr]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class ConfigFrame:
+    """
+    Columnar container for the field values of many `Bonfig` instances of the same class.
+
+    Each field of `bonfig_cls` becomes a column, named after the field's attribute name. Rows can then be filtered,
+    sorted and aggregated without going through `Field.__get__` for each instance. Values that are missing (and have
+    no default) are `None`.
+
+    Create using :py:meth:`ConfigFrame.from_instances` or :py:meth:`ConfigFrame.from_stores`.
+
+    Examples
+    --------
+    >>> frame = ConfigFrame.from_instances(Run, runs)
+    >>> adam = frame[(frame['lr'] > 0.01) & (frame['optimiser'] == 'adam')]
+    >>> adam['loss'].mean()
+    0.213
+    >>> best = adam.sort('loss').instance(0)
+    """
+
+    def __init__(self, bonfig_cls, columns, sources, from_stores):
+        self.bonfig_cls = bonfig_cls
+        self._columns = columns
+        self._sources = sources
+        self._from_stores = from_stores
+
+    @classmethod
+    def from_instances(cls, bonfig_cls, instances):
+        """Create frame from `Bonfig` instances.
+
+        """
+        instances = list(instances)
+        columns = {}
+        for attr_name, field in sorted(_field_attrs(bonfig_cls).items()):
+            values = []
+            for instance in instances:
+                try:
+                    values.append(getattr(instance, attr_name))
+                except (KeyError, TypeError, ValueError):
+                    values.append(None)
+            columns[attr_name] = _make_column(values, field)
+        return cls(bonfig_cls, columns, instances, False)
+
+    @classmethod
+    def from_stores(cls, bonfig_cls, stores):
+        """Create frame from raw stores, without creating any `Bonfig` instances.
+
+        Parameters
+        ----------
+        bonfig_cls : BonfigType
+        stores : iterable of dict
+            For each row, a mapping of store attribute names to stores, i.e. what :py:meth:`Bonfig.load` would set.
+            As when initialising a `Bonfig`, fields with a `val` take that value, rather than the value in the store.
+        """
+        stores = list(stores)
+        columns = {}
+        for attr_name, field in sorted(_field_attrs(bonfig_cls).items()):
+            if field.val is not None:
+                value = field._post_get(field._pre_set(field.val))
+                values = [value] * len(stores)
+            else:
+                values = [_read_stores(field, row) for row in stores]
+            columns[attr_name] = _make_column(values, field)
+        return cls(bonfig_cls, columns, stores, True)
+
+    @property
+    def columns(self):
+        """Names of columns.
+
+        """
+        return list(self._columns)
+
+    def __len__(self):
+        return len(self._sources)
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            return Column(item, self._columns[item])
+        if isinstance(item, Mask):
+            return self.take(item.indices())
+        return self.take(Mask(item).indices())
+
+    def take(self, indices):
+        """New frame containing only rows at `indices`, in that order.
+
+        """
+        indices = list(indices)
+        columns = {name: _take(data, indices) for name, data in self._columns.items()}
+        sources = [self._sources[i] for i in indices]
+        return self.__class__(self.bonfig_cls, columns, sources, self._from_stores)
+
+    def sort(self, by, reverse=False):
+        """New frame sorted by column `by`. Missing values are put last.
+
+        """
+        data = self._columns[by]
+        if numpy is not None and data.dtype != object:
+            indices = numpy.argsort(data, kind='stable')
+            if reverse:
+                indices = indices[::-1]
+        else:
+            present = [i for i in range(len(data)) if data[i] is not None]
+            indices = sorted(present, key=data.__getitem__, reverse=reverse)
+            indices += [i for i in range(len(data)) if data[i] is None]
+        return self.take(indices)
+
+    def instance(self, i):
+        """Get `Bonfig` instance for row `i`.
+
+        For frames created from stores, a new frozen instance is created from a copy of the row's stores each time
+        this is called, leaving the row itself untouched. Stores that are instances of
+        :py:class:`bonfig.stores.BaseStore` are used as they are, rather than copied.
+        """
+        source = self._sources[i]
+        if not self._from_stores:
+            return source
+
+        bonfig = self.bonfig_cls.__new__(self.bonfig_cls)
+        bonfig._frozen = False
+        for store_attr, store in source.items():
+            setattr(bonfig, store_attr, _copy_store(store))
+        for field in self.bonfig_cls.__fields__:
+            field._initialise(bonfig)
+        bonfig.freeze()
+        return bonfig
+
+    def instances(self):
+        """Iterate over `Bonfig` instances of every row.
+
+        """
+        for i in range(len(self)):
+            yield self.instance(i)
+
+    def __repr__(self):
+        return "<{} of {}: {} rows, columns {}>".format(self.__class__.__name__, self.bonfig_cls.__name__,
+                                                        len(self), self.columns)
@@ -0,0 +1,204 @@
+"""
+Write-behind persistence of editable `Bonfig` s.
+
+Rather than writing a whole store back to disk after every change, a :py:class:`WriteBehind` subscribes to a
+`Bonfig` (see :py:meth:`Bonfig.subscribe`), records the key paths that are written to, and then persists them all
+at once, at most once per `interval`. Each store is persisted by a writer, a callable taking the store and the
+dirty key paths within it, e.g. :py:class:`JSONFileWriter`, which only re-serialises the sections that changed.
+"""
+
+import atexit
+import json
+import os
+import stat
+import tempfile
+import threading
+import weakref
+
+
+_active = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    """Flush every open `WriteBehind`, called when the interpreter exits.
+
+    """
+    for write_behind in list(_active):
+        write_behind.flush()
+
+
+def _to_dict(obj):
+    if hasattr(obj, 'keys') and hasattr(obj, '__getitem__'):
+        return {k: obj[k] for k in obj.keys()}
+    raise TypeError("Object of type {} is not JSON serializable".format(obj.__class__.__name__))
+
+
+class JSONFileWriter:
+    """
+    Writer that persists a store as a JSON object in the file at `path`.
+
+    The serialised JSON of each top level key (i.e. section) of the store is kept, so that on each write only the
+    sections containing dirty paths are serialised again, then spliced together with the rest. Files are written to
+    a temporary file first, then moved into place using `os.replace`, so `path` always holds a complete config. If
+    `path` already exists, its permissions are kept.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+    indent : int, optional
+        Indent of each section, passed to `json.dumps`.
+    """
+
+    def __init__(self, path, indent=None):
+        self.path = os.fspath(path)
+        self.indent = indent
+        self._fragments = None
+
+    def _fragment(self, key, value):
+        return '{}: {}'.format(json.dumps(key), json.dumps(value, default=_to_dict, indent=self.indent))
+
+    def __call__(self, store, paths):
+        if self._fragments is None:
+            self._fragments = {key: self._fragment(key, store[key]) for key in store.keys()}
+        else:
+            for key in {path[0] for path in paths}:
+                if key in store:
+                    self._fragments[key] = self._fragment(key, store[key])
+                else:
+                    self._fragments.pop(key, None)
+
+        separator = ',\n' if self.indent is not None else ', '
+        text = '{' + separator.join(self._fragments.values()) + '}'
+
+        directory, name = os.path.split(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix='.' + name + '.', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.chmod(tmp, stat.S_IMODE(os.stat(self.path).st_mode))
+            except FileNotFoundError:
+                pass
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def commit_writer(store, paths):
+    """Writer for stores that batch up their own writes, such as :py:class:`bonfig.sqlite.SQLiteStore`, which
+    persists them by calling `store.commit()`.
+
+    """
+    store.commit()
+
+
+class WriteBehind:
+    """
+    Track writes to `bonfig`, and persist them in the background, coalescing all the writes made within `interval`.
+
+    Parameters
+    ----------
+    bonfig : Bonfig
+        Unfrozen `Bonfig` to persist.
+    writers : dict, optional
+        Maps store attribute names to writers, callables that are passed the store and the `set` of dirty key paths
+        within it. By default, stores with a `commit` method (such as :py:class:`bonfig.sqlite.SQLiteStore`) use
+        :py:func:`commit_writer`, and other stores are not persisted.
+    interval : float or None, optional
+        Seconds after the first unpersisted write that dirty stores are flushed. If `None`, stores are only
+        flushed by calling :py:meth:`WriteBehind.flush`, or on exit.
+
+    Notes
+    -----
+    Automatic flushes are made on a background thread, which reads the stores being flushed. Make writes that must be
+    persisted together within :py:meth:`Bonfig.batch`, so that they're recorded at the same time.
+
+    Any `WriteBehind` that hasn't been closed is flushed when the interpreter exits.
+
+    Examples
+    --------
+    >>> c = Config(frozen=False)
+    >>> persist = WriteBehind(c, {'s': JSONFileWriter('config.json')}, interval=5)
+    >>> c.host = 'example.com'  # written within 5 seconds
+    >>> persist.close()  # or written now
+    """
+
+    def __init__(self, bonfig, writers=None, interval=1.0):
+        if writers is None:
+            writers = {store_attr: commit_writer for store_attr in bonfig.__store_attrs__
+                       if hasattr(getattr(bonfig, store_attr), 'commit')}
+        if not writers:
+            raise ValueError("No writers for any stores of {}".format(bonfig))
+
+        self.bonfig = bonfig
+        self.writers = writers
+        self.interval = interval
+        self._dirty = set()
+        self._lock = threading.RLock()
+        self._timer = None
+        self._unsubscribe = bonfig.subscribe(self._record)
+        _active.add(self)
+
+    @property
+    def dirty(self):
+        """`frozenset` of the paths (store attribute name followed by keys) written to since the last flush.
+
+        """
+        with self._lock:
+            return frozenset(self._dirty)
+
+    def _record(self, changes):
+        with self._lock:
+            self._dirty.update(change.path for change in changes if change.path[0] in self.writers)
+            if self._dirty and self._timer is None and self.interval is not None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Persist every dirty store now.
+
+        If a writer fails, the paths it was writing remain dirty, and the exception is raised.
+
+        Returns
+        -------
+        paths : set
+            Paths that were persisted.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            dirty, self._dirty = self._dirty, set()
+
+            by_store = {}
+            for path in dirty:
+                by_store.setdefault(path[0], set()).add(path[1:])
+
+            flushed = set()
+            try:
+                for store_attr, paths in by_store.items():
+                    self.writers[store_attr](getattr(self.bonfig, store_attr), paths)
+                    flushed.update((store_attr,) + path for path in paths)
+            except BaseException:
+                self._dirty.update(dirty - flushed)
+                raise
+            return flushed
+
+    def close(self):
+        """Flush, then stop tracking writes.
+
+        """
+        self.flush()
+        self._unsubscribe()
+        _active.discard(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
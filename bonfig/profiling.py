@@ -0,0 +1,180 @@
+"""
+Tools for finding out where time and memory go when creating `Bonfig` s. Used by ``python -m bonfig``.
+"""
+
+import importlib
+import time
+
+from bonfig.core import Bonfig, BonfigType, _sizeof, _field_attrs
+
+
+def import_bonfig(path, created=None):
+    """Import a `Bonfig` subclass from a path like ``'package.module:Config'`` or ``'package.module.Config'``.
+
+    Parameters
+    ----------
+    path : str
+    created : dict, optional
+        If given, the time taken to create each `Bonfig` class defined while importing is recorded in it, keyed by
+        class, using a listener added with :py:meth:`Bonfig.add_listener` just before importing. Classes of modules
+        that were already imported aren't created again, so aren't recorded.
+    """
+    if ':' in path:
+        module_name, _, attr_path = path.partition(':')
+    else:
+        module_name, _, attr_path = path.rpartition('.')
+    if not module_name or not attr_path:
+        raise ValueError("Can't import {!r}, expected 'module:Class'".format(path))
+
+    remove = None
+    if created is not None:
+        def record(event):
+            if event.phase == 'class':
+                created[event.bonfig_cls] = event.duration
+        remove = Bonfig.add_listener(record)
+    try:
+        obj = importlib.import_module(module_name)
+    finally:
+        if remove is not None:
+            remove()
+
+    for attr in attr_path.split('.'):
+        obj = getattr(obj, attr)
+
+    if not isinstance(obj, BonfigType):
+        raise TypeError("{!r} is not a Bonfig subclass".format(path))
+    return obj
+
+
+def profile_bonfig(cls, args=(), kwargs=None, frozen=True, repeat=1000, timer=time.perf_counter,
+                   class_creation=None):
+    """Profile creating and using an instance of `cls`.
+
+    The instance is created as usual, with its phases timed by a listener added using :py:meth:`Bonfig.add_listener`.
+    The time taken to initialise each field is then measured separately, by initialising them one at a time on a
+    second instance, after calling its :py:meth:`Bonfig.load`.
+
+    Parameters
+    ----------
+    cls : BonfigType
+        `Bonfig` subclass to profile.
+    args, kwargs : optional
+        Arguments passed on to :py:meth:`Bonfig.load`.
+    frozen : bool, optional
+        Whether to freeze the instance.
+    repeat : int, optional
+        Number of times each field is read in order to time repeated access.
+    class_creation : float, optional
+        Time taken to create `cls`, if known, e.g. as recorded by :py:func:`import_bonfig`.
+
+    Returns
+    -------
+    report : dict
+        Timings in seconds, with keys `'class_creation'`, `'load'`, `'initialise'` (per field),
+        `'initialise_stores'` (per store), `'freeze'` and `'access'` (per field, `'first'` and mean `'repeat'` read
+        times), plus `'stores'`: the approximate bytes retained by each store.
+
+    Notes
+    -----
+    Listeners added to `cls` or its bases see the events of the instance created here too. As two instances are
+    created, :py:meth:`Bonfig.load` is called twice.
+    """
+    kwargs = kwargs or {}
+    fields = _field_attrs(cls)
+
+    events = []
+    remove = cls.add_listener(events.append)
+    try:
+        bonfig = cls(*args, frozen=frozen, **kwargs)
+    finally:
+        remove()
+
+    load = 0.0
+    initialise_stores = {store_attr: 0.0 for store_attr in sorted(cls.__store_attrs__)}
+    freeze = 0.0 if frozen else None
+    for event in events:
+        if event.bonfig is not bonfig:
+            continue
+        if event.phase == 'load':
+            load += event.duration
+        elif event.phase == 'initialise':
+            initialise_stores[event.store_attr] += event.duration
+        elif event.phase == 'freeze':
+            freeze += event.duration
+
+    scratch = cls.__new__(cls)
+    scratch._frozen = False
+    scratch.load(*args, **kwargs)
+    initialise = {}
+    for attr_name, field in sorted(fields.items()):
+        start = timer()
+        field._initialise(scratch)
+        initialise[attr_name] = timer() - start
+
+    access = {}
+    for attr_name in sorted(fields):
+        stats = access[attr_name] = {}
+        try:
+            start = timer()
+            getattr(bonfig, attr_name)
+            stats['first'] = timer() - start
+
+            start = timer()
+            for _ in range(repeat):
+                getattr(bonfig, attr_name)
+            stats['repeat'] = (timer() - start) / repeat
+        except Exception as e:
+            stats['error'] = "{}: {}".format(e.__class__.__name__, e)
+
+    seen = set()
+    stores = {store_attr: _sizeof(getattr(bonfig, store_attr), seen) for store_attr in sorted(bonfig.__store_attrs__)}
+
+    return {'class': "{}:{}".format(cls.__module__, cls.__qualname__),
+            'class_creation': class_creation,
+            'load': load,
+            'initialise': initialise,
+            'initialise_stores': initialise_stores,
+            'freeze': freeze,
+            'access': access,
+            'stores': stores}
+
+
+def _fmt_time(seconds):
+    if seconds is None:
+        return '-'
+    if seconds >= 1:
+        return '{:.3f} s'.format(seconds)
+    if seconds >= 1e-3:
+        return '{:.3f} ms'.format(seconds * 1e3)
+    return '{:.3f} us'.format(seconds * 1e6)
+
+
+def format_report(report):
+    """Format `report`, as returned by :py:func:`profile_bonfig`, as human-readable text.
+
+    """
+    total_initialise = sum(report['initialise_stores'].values())
+    lines = ["Profile of {}".format(report['class']),
+             "",
+             "  class creation  {}".format(_fmt_time(report['class_creation'])),
+             "  load()          {}".format(_fmt_time(report['load'])),
+             "  initialise      {} ({} fields)".format(_fmt_time(total_initialise), len(report['initialise'])),
+             "  freeze()        {}".format(_fmt_time(report['freeze'])),
+             "",
+             "  {:<30} {:>12} {:>12} {:>12}".format('field', 'initialise', 'first get', 'repeat get')]
+
+    for attr_name, stats in report['access'].items():
+        if 'error' in stats:
+            first, repeat = stats['error'], ''
+        else:
+            first, repeat = _fmt_time(stats['first']), _fmt_time(stats['repeat'])
+        lines.append("  {:<30} {:>12} {:>12} {:>12}".format(attr_name,
+                                                             _fmt_time(report['initialise'][attr_name]),
+                                                             first, repeat))
+
+    lines += ["", "  {:<30} {:>12} {:>12}".format('store', 'initialise', 'bytes')]
+    for store_attr, size in report['stores'].items():
+        lines.append("  {:<30} {:>12} {:>12}".format(store_attr,
+                                                     _fmt_time(report['initialise_stores'].get(store_attr)), size))
+
+    return "\n".join(lines)
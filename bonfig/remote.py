@@ -0,0 +1,278 @@
+"""
+Stores that load their contents from a config server over HTTP.
+"""
+
+import concurrent.futures
+import hashlib
+import http.client
+import json
+import os
+import tempfile
+import threading
+import urllib.parse
+
+from bonfig.stores import BaseStore, _freeze
+
+
+class RemoteError(OSError):
+    """Raised when a config server responds with an unexpected status.
+
+    """
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of persistent `http.client` connections, keyed by scheme, host and port.
+
+    Connections are returned to the pool after each request, so that subsequent requests to the same server re-use
+    them rather than opening new connections.
+
+    Parameters
+    ----------
+    timeout : float, optional
+        Socket timeout in seconds for new connections.
+    max_idle : int, optional
+        Maximum number of idle connections to keep per server.
+    """
+
+    def __init__(self, timeout=10, max_idle=4):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, scheme, netloc):
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        if scheme == 'http':
+            return http.client.HTTPConnection(netloc, timeout=self.timeout)
+        raise ValueError("Unsupported URL scheme {!r}".format(scheme))
+
+    def _checkout(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(*key), False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method, url, headers=None):
+        """Make a request, returning `(status, headers, body)`.
+
+        If a pooled connection turns out to have been closed by the server, the request is retried once on a new
+        connection.
+        """
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        conn, reused = self._checkout(key)
+        try:
+            try:
+                conn.request(method, path, headers=headers or {})
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                conn.close()
+                conn = self._connect(*key)
+                conn.request(method, path, headers=headers or {})
+                response = conn.getresponse()
+            body = response.read()
+        except BaseException:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+        return response.status, response.headers, body
+
+    def close(self):
+        """Close all idle connections.
+
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+default_pool = ConnectionPool()
+
+
+class HTTPStore(BaseStore):
+    """
+    Store whose contents are a JSON document fetched from a config server.
+
+    Documents are fetched using a shared :py:class:`ConnectionPool`, and refreshed with conditional requests
+    (`If-None-Match`), so unchanged documents aren't downloaded again. If `cache_dir` is given, each document is also
+    saved to disk along with its `ETag`, which is used as a fallback whenever the server can't be reached, and to make
+    the first request from a new process conditional too.
+
+    Parameters
+    ----------
+    url : str
+        URL of document.
+    cache_dir : str, optional
+        Directory to keep on-disk copies of documents in.
+    pool : ConnectionPool, optional
+        Connection pool to use, defaults to a pool shared by all `HTTPStore` s.
+    decode : callable, optional
+        Function to turn the response body (`bytes`) into a mapping, defaults to `json.loads`.
+    fetch : bool, optional
+        Fetch the document straight away, default `True`.
+
+    Examples
+    --------
+    >>> class Config(Bonfig):
+    ...     s = Store()
+    ...     db = s.Field()
+    ...
+    ...     def load(self, service):
+    ...         self.s = HTTPStore('http://config.local/{}.json'.format(service), cache_dir='/var/cache/config')
+    """
+    __slots__ = ('url', 'cache_dir', 'pool', 'decode', 'data', 'etag', 'from_cache')
+
+    def __init__(self, url, cache_dir=None, pool=None, decode=json.loads, fetch=True):
+        self.url = url
+        self.cache_dir = cache_dir
+        self.pool = pool or default_pool
+        self.decode = decode
+        self.data = None
+        self.etag = None
+        self.from_cache = False
+
+        if fetch:
+            self.refresh()
+
+    @property
+    def _cache_path(self):
+        return os.path.join(self.cache_dir, hashlib.sha256(self.url.encode()).hexdigest() + '.json')
+
+    def _read_cache(self):
+        try:
+            with open(self._cache_path, encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self.data = self.decode(cached['body'].encode('utf-8'))
+        self.etag = cached['etag']
+        self.from_cache = True
+        return True
+
+    def _write_cache(self, body):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'url': self.url, 'etag': self.etag, 'body': body.decode('utf-8')}, f)
+            os.replace(tmp, self._cache_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def refresh(self):
+        """Fetch the document if it has changed since it was last fetched.
+
+        Returns
+        -------
+        changed : bool
+            `True` if new contents were loaded.
+
+        Raises
+        ------
+        OSError
+            If the server can't be reached, or responds with an error, and there's no on-disk copy to fall back to.
+        http.client.HTTPException
+            If the server sends an invalid or incomplete response, and there's no on-disk copy to fall back to.
+        """
+        if self.data is None and self.cache_dir is not None:
+            self._read_cache()
+
+        headers = {'Accept': 'application/json'}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+
+        try:
+            status, response_headers, body = self.pool.request('GET', self.url, headers)
+            if status == 304 and self.data is not None:
+                return False
+            if status != 200:
+                raise RemoteError("{} responded with status {}".format(self.url, status))
+        except (OSError, http.client.HTTPException):
+            if self.data is None:
+                raise
+            return False
+
+        self.data = self.decode(body)
+        self.etag = response_headers.get('ETag')
+        self.from_cache = False
+        if self.cache_dir is not None:
+            self._write_cache(body)
+        return True
+
+    @classmethod
+    def fetch_many(cls, urls, max_workers=8, **kwargs):
+        """Create and fetch a store for each of `urls` in parallel.
+
+        Parameters
+        ----------
+        urls : iterable of str
+        max_workers : int, optional
+            Maximum number of concurrent requests.
+        **kwargs
+            Passed on to `HTTPStore`.
+
+        Returns
+        -------
+        stores : list of HTTPStore
+        """
+        stores = [cls(url, fetch=False, **kwargs) for url in urls]
+        refresh_all(stores, max_workers)
+        return stores
+
+    def _loaded(self):
+        if self.data is None:
+            raise RuntimeError("{} hasn't been fetched".format(self.url))
+        return self.data
+
+    def __getitem__(self, key):
+        return self._loaded()[key]
+
+    def __setitem__(self, key, value):
+        self._loaded()[key] = value
+
+    def __delitem__(self, key):
+        del self._loaded()[key]
+
+    def __iter__(self):
+        return iter(self._loaded())
+
+    def __len__(self):
+        return len(self._loaded())
+
+    def frozen(self):
+        return _freeze(self._loaded())
+
+    def __repr__(self):
+        return "<{}: {} (etag={})>".format(self.__class__.__name__, self.url, self.etag)
+
+
+def refresh_all(stores, max_workers=8):
+    """Refresh `stores` in parallel, returning a list of whether each changed.
+
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda store: store.refresh(), stores))
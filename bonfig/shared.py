@@ -0,0 +1,231 @@
+"""
+Sharing frozen `Bonfig` s between processes without each process holding its own copy.
+
+A frozen `Bonfig` 's stores are packed once into a flat binary layout, with a sorted index of key paths to value
+offsets, and written to shared memory (or a file that's memory-mapped). Other processes then attach to it read-only,
+and values are only decoded when they're read, such that the memory is paid for once per host, rather than once per
+process.
+
+Layout
+------
+- header: magic ``b'BNFG'``, format version, number of entries (``'<4sHI'``)
+- index: for each entry, sorted by path, the offset and length of its path and of its value (``'<IIII'``)
+- data: paths (keys joined by ``SEP``, UTF-8 encoded) and values (JSON, UTF-8 encoded)
+"""
+
+import json
+import mmap
+import struct
+import sys
+
+from bonfig.stores import BaseStore, _is_mapping
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+
+SEP = b'\x1f'
+
+_created = set()
+
+_MAGIC = b'BNFG'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHI')
+_ENTRY = struct.Struct('<IIII')
+
+
+def _flatten(mapping, path, out):
+    for key in mapping.keys():
+        value = mapping[key]
+        if not isinstance(key, str):
+            raise TypeError("Only str keys can be shared, not {!r}".format(key))
+        if '\x1f' in key:
+            raise ValueError("Keys containing the separator '\\x1f' can't be shared, found {!r}".format(key))
+        key_path = path + (key,)
+        if _is_mapping(value):
+            _flatten(value, key_path, out)
+        else:
+            out.append((SEP.join(k.encode('utf-8') for k in key_path), json.dumps(value).encode('utf-8')))
+
+
+def pack(bonfig):
+    """Pack the stores of `bonfig` into the flat binary layout described by this module.
+
+    Values must be JSON serialisable. Empty sections aren't kept.
+
+    Returns
+    -------
+    data : bytes
+    """
+    entries = []
+    for store_attr in sorted(bonfig.__store_attrs__):
+        _flatten(getattr(bonfig, store_attr), (store_attr,), entries)
+    entries.sort()
+
+    offset = _HEADER.size + _ENTRY.size * len(entries)
+    index, data = [], []
+    for path, value in entries:
+        index.append(_ENTRY.pack(offset, len(path), offset + len(path), len(value)))
+        data += [path, value]
+        offset += len(path) + len(value)
+
+    return b''.join([_HEADER.pack(_MAGIC, _VERSION, len(entries))] + index + data)
+
+
+class SharedStore(BaseStore):
+    """
+    Read-only store that decodes values straight out of a buffer created by :py:func:`pack`.
+
+    Lookups are a binary search over the buffer's index, so nothing is copied into the process other than the values
+    that are read.
+    """
+    __slots__ = ('buffer', 'prefix', '_count')
+
+    def __init__(self, buffer, prefix):
+        self.buffer = buffer
+        self.prefix = prefix
+        magic, version, self._count = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Buffer doesn't contain a packed Bonfig")
+
+    def _entry(self, i):
+        return _ENTRY.unpack_from(self.buffer, _HEADER.size + _ENTRY.size * i)
+
+    def _path(self, i):
+        path_offset, path_len, value_offset, value_len = self._entry(i)
+        return bytes(self.buffer[path_offset:path_offset + path_len])
+
+    def _bisect(self, path):
+        """Index of first entry whose path is >= `path`.
+
+        """
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._path(mid) < path:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def __getitem__(self, key):
+        path = self.prefix + key.encode('utf-8')
+        i = self._bisect(path)
+        if i < self._count:
+            path_offset, path_len, value_offset, value_len = self._entry(i)
+            found = bytes(self.buffer[path_offset:path_offset + path_len])
+            if found == path:
+                return json.loads(bytes(self.buffer[value_offset:value_offset + value_len]).decode('utf-8'))
+            if found.startswith(path + SEP):
+                return SharedStore(self.buffer, path + SEP)
+        raise KeyError(key)
+
+    def __iter__(self):
+        n = len(self.prefix)
+        previous = None
+        for i in range(self._bisect(self.prefix), self._count):
+            path = self._path(i)
+            if not path.startswith(self.prefix):
+                break
+            key = path[n:].split(SEP, 1)[0]
+            if key != previous:
+                previous = key
+                yield key.decode('utf-8')
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __setitem__(self, key, value):
+        raise TypeError("'{}' object does not support item assignment".format(self.__class__.__name__))
+
+    def __delitem__(self, key):
+        raise TypeError("'{}' object does not support item deletion".format(self.__class__.__name__))
+
+    def frozen(self):
+        return self
+
+    def __repr__(self):
+        return "<{}: {!r}>".format(self.__class__.__name__, self.prefix.decode('utf-8').replace('\x1f', '.'))
+
+
+def from_buffer(bonfig_cls, buffer, _owner=None):
+    """Create a frozen instance of `bonfig_cls` whose stores read from `buffer`, without copying it.
+
+    """
+    bonfig = bonfig_cls.__new__(bonfig_cls)
+    bonfig._frozen = True
+    for store_attr in bonfig_cls.__store_attrs__:
+        setattr(bonfig, store_attr, SharedStore(buffer, store_attr.encode('utf-8') + SEP))
+    bonfig._shared_owner = _owner  # keeps shared memory/ mmap open for as long as the instance is alive
+    return bonfig
+
+
+def share(bonfig, name=None):
+    """Pack `bonfig` into a new block of shared memory.
+
+    The caller is responsible for calling `unlink()` on the returned block once no process needs it anymore.
+
+    Parameters
+    ----------
+    bonfig : Bonfig
+    name : str, optional
+        Name for the shared memory block, by default a random name is chosen.
+
+    Returns
+    -------
+    block : multiprocessing.shared_memory.SharedMemory
+        Pass `block.name` to :py:func:`attach` in other processes.
+    """
+    if shared_memory is None:
+        raise RuntimeError("multiprocessing.shared_memory requires Python 3.8+, use share_file instead")
+    data = pack(bonfig)
+    block = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+    block.buf[:len(data)] = data
+    _created.add(block._name)
+    return block
+
+
+def attach(bonfig_cls, name):
+    """Attach, read-only, to a block of shared memory created by :py:func:`share`.
+
+    Returns
+    -------
+    bonfig : Bonfig
+        Frozen instance of `bonfig_cls`.
+    """
+    if shared_memory is None:
+        raise RuntimeError("multiprocessing.shared_memory requires Python 3.8+, use attach_file instead")
+    if sys.version_info >= (3, 13):
+        block = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        # Before 3.13 attaching registers the block with the resource tracker, which unlinks it when this process
+        # exits, pulling it out from under every other process (bpo-39959). The creator is responsible for unlinking,
+        # so undo the registration, unless this process is the creator, which shares the same registration.
+        block = shared_memory.SharedMemory(name=name)
+        if getattr(shared_memory, '_USE_POSIX', False) and block._name not in _created:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(block._name, 'shared_memory')
+    return from_buffer(bonfig_cls, block.buf.toreadonly(), _owner=block)
+
+
+def share_file(bonfig, path):
+    """Pack `bonfig` into the file at `path`, for use with :py:func:`attach_file`.
+
+    """
+    with open(path, 'wb') as f:
+        f.write(pack(bonfig))
+
+
+def attach_file(bonfig_cls, path):
+    """Memory-map the file at `path`, as written by :py:func:`share_file`, read-only.
+
+    Returns
+    -------
+    bonfig : Bonfig
+        Frozen instance of `bonfig_cls`.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return from_buffer(bonfig_cls, mapped, _owner=mapped)
@@ -0,0 +1,306 @@
+"""
+Store backed by a local SQLite database, for large configs that shouldn't be loaded whole.
+"""
+
+import contextlib
+import json
+import sqlite3
+import threading
+
+from bonfig.stores import BaseStore, _is_mapping
+
+
+SEP = '\x1f'
+"""Separator used to join keys into the paths stored in the database. Keys must not contain it."""
+
+_SECTION = object()
+_DELETED = object()
+
+
+def _encode_path(keys):
+    return SEP.join(keys)
+
+
+def _decode_path(path):
+    return tuple(path.split(SEP))
+
+
+def _prefix_range(keys):
+    """Range of encoded paths that lie below `keys`, for use with the index on `path`.
+
+    """
+    prefix = _encode_path(keys) + SEP if keys else ''
+    return prefix, prefix + '\U0010ffff'
+
+
+class _SQLiteSection(BaseStore):
+    """Section of a :py:class:`SQLiteStore`, reading and writing through to it.
+
+    """
+    __slots__ = ('store', 'keys')
+
+    def __init__(self, store, keys):
+        self.store = store
+        self.keys = keys
+
+    def __getitem__(self, key):
+        path = self.keys + (key,)
+        value = self.store._get(path)
+        if value is _SECTION:
+            return _SQLiteSection(self.store, path)
+        return value
+
+    def __setitem__(self, key, value):
+        self.store._set(self.keys + (key,), value)
+
+    def __delitem__(self, key):
+        self.store._delete(self.keys + (key,))
+
+    def __iter__(self):
+        return iter(self.store._children(self.keys))
+
+    def __len__(self):
+        return len(self.store._children(self.keys))
+
+    def frozen(self):
+        return self
+
+    def __repr__(self):
+        return "<{}: {} of {!r}>".format(self.__class__.__name__, list(self.keys), self.store)
+
+
+class SQLiteStore(_SQLiteSection):
+    """
+    Store backed by a table in a SQLite database, with a row per value, keyed by its full key path.
+
+    Values are only queried when they're first read (using the same, cached, prepared statements every time), then
+    kept in memory. The paths `Field` s of a `Bonfig` class look in can be loaded in bulk ahead of time using
+    :py:meth:`SQLiteStore.preload_fields`.
+
+    Writes are held in memory until :py:meth:`SQLiteStore.commit` is called, which writes them all in a single
+    transaction.
+
+    Values are stored as JSON, and sections aren't stored explicitly, instead they exist as long as there are values
+    below them. Freezing the store doesn't copy it, it only stops writes.
+
+    Notes
+    -----
+    Connections opened by the store can be used from any thread, with access to them serialised by a lock, so that
+    e.g. a :py:class:`bonfig.persist.WriteBehind` can commit from its background thread. A `sqlite3.Connection`
+    passed in as `database` must be opened with ``check_same_thread=False`` for the same to apply.
+
+    Parameters
+    ----------
+    database : str or sqlite3.Connection
+        Path to database, or an open connection.
+    table : str, optional
+        Name of table to use, created if it doesn't exist.
+
+    Examples
+    --------
+    >>> class Config(Bonfig):
+    ...     s = Store()
+    ...     db = s.Section()
+    ...     host = db.Field()
+    ...
+    ...     def load(self):
+    ...         self.s = SQLiteStore('config.db')
+    ...         self.s.preload_fields(self.__class__, 's')
+    """
+    __slots__ = ('connection', 'table', 'is_frozen', '_values', '_pending', '_sections', '_sql', '_lock')
+
+    def __init__(self, database, table='bonfig'):
+        super().__init__(self, ())
+        if isinstance(database, sqlite3.Connection):
+            self.connection = database
+        else:
+            self.connection = sqlite3.connect(database, check_same_thread=False)
+        if not table.isidentifier():
+            raise ValueError("Invalid table name {!r}".format(table))
+        self.table = table
+        self.is_frozen = False
+
+        self._lock = threading.RLock()
+        self._values = {}
+        self._pending = {}
+        self._sections = set()
+        self._sql = {
+            'get': "SELECT value FROM {} WHERE path = ?".format(table),
+            'below': "SELECT path FROM {} WHERE path >= ? AND path < ?".format(table),
+            'any_below': "SELECT 1 FROM {} WHERE path >= ? AND path < ? LIMIT 1".format(table),
+            'set': "INSERT OR REPLACE INTO {} (path, value) VALUES (?, ?)".format(table),
+            'delete': "DELETE FROM {} WHERE path = ?".format(table),
+            'delete_below': "DELETE FROM {} WHERE path >= ? AND path < ?".format(table),
+        }
+
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS {} "
+                                    "(path TEXT PRIMARY KEY NOT NULL, value TEXT NOT NULL)".format(table))
+
+    def _is_section(self, keys):
+        with self._lock:
+            if keys in self._sections:
+                return True
+            for path in self._pending:
+                if path[:len(keys)] == keys and len(path) > len(keys) and self._pending[path] is not _DELETED:
+                    return True
+            return self.connection.execute(self._sql['any_below'], _prefix_range(keys)).fetchone() is not None
+
+    def _get(self, keys):
+        with self._lock:
+            if keys in self._pending:
+                pending = self._pending[keys]
+                if pending is _DELETED:
+                    raise KeyError(keys[-1])
+                return pending
+
+            try:
+                return self._values[keys]
+            except KeyError:
+                pass
+
+            row = self.connection.execute(self._sql['get'], (_encode_path(keys),)).fetchone()
+            if row is not None:
+                value = self._values[keys] = json.loads(row[0])
+            elif self._is_section(keys):
+                value = self._values[keys] = _SECTION
+            else:
+                raise KeyError(keys[-1])
+            return value
+
+    def _check_frozen(self):
+        if self.is_frozen:
+            raise TypeError("'{}' object does not support item assignment".format(self.__class__.__name__))
+
+    def _set(self, keys, value):
+        with self._lock:
+            self._check_frozen()
+            if _is_mapping(value):
+                self._sections.add(keys)
+                for k in value.keys():
+                    self._set(keys + (k,), value[k])
+                return
+            for i in range(1, len(keys)):
+                self._sections.add(keys[:i])
+            self._pending[keys] = value
+
+    def _delete(self, keys):
+        with self._lock:
+            self._check_frozen()
+            value = self._get(keys)
+            if value is _SECTION:
+                for child in self._children(keys):
+                    self._delete(keys + (child,))
+                self._sections.discard(keys)
+                self._values.pop(keys, None)
+            else:
+                self._pending[keys] = _DELETED
+
+    def _children(self, keys):
+        with self._lock:
+            n = len(keys)
+            children = []
+            seen = set()
+
+            def add(path):
+                if path[:n] == keys and len(path) > n and path[n] not in seen:
+                    seen.add(path[n])
+                    children.append(path[n])
+
+            for (path,) in self.connection.execute(self._sql['below'], _prefix_range(keys)):
+                path = _decode_path(path)
+                if self._pending.get(path) is not _DELETED:
+                    add(path)
+            for path, value in self._pending.items():
+                if value is not _DELETED:
+                    add(path)
+            for path in self._sections:
+                add(path)
+            return children
+
+    def preload(self, paths):
+        """Load the values at each of `paths` (tuples of keys) from the database in bulk.
+
+        """
+        with self._lock:
+            paths = [tuple(path) for path in paths if tuple(path) not in self._values]
+            for i in range(0, len(paths), 500):
+                chunk = paths[i:i + 500]
+                query = "SELECT path, value FROM {} WHERE path IN ({})".format(self.table, ', '.join('?' * len(chunk)))
+                for path, value in self.connection.execute(query, [_encode_path(path) for path in chunk]):
+                    self._values[_decode_path(path)] = json.loads(value)
+
+    def preload_fields(self, bonfig_cls, store_attr):
+        """Load the value of every `Field` of `bonfig_cls` that belongs to the store `store_attr` in bulk.
+
+        """
+        self.preload(field._key_path for field in bonfig_cls.__fields__ if field.store_attr == store_attr)
+
+    @property
+    def dirty(self):
+        """`True` if there are writes that haven't been committed.
+
+        """
+        with self._lock:
+            return bool(self._pending)
+
+    def commit(self):
+        """Write all pending writes to the database in a single transaction.
+
+        Pending writes are swapped out for an empty batch under the store's lock, which is held until they're written,
+        so writes from other threads are either part of the batch or left pending for the next commit.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            sets = [(_encode_path(path), json.dumps(value)) for path, value in pending.items() if value is not _DELETED]
+            deletes = [(_encode_path(path),) for path, value in pending.items() if value is _DELETED]
+            try:
+                with self.connection:
+                    self.connection.executemany(self._sql['delete'], deletes)
+                    self.connection.executemany(self._sql['set'], sets)
+            except BaseException:
+                pending.update(self._pending)
+                self._pending = pending
+                raise
+
+            for path, value in pending.items():
+                if value is _DELETED:
+                    self._values.pop(path, None)
+                else:
+                    self._values[path] = value
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Context manager that commits writes made within it on exit, unless an exception is raised.
+
+        If an exception is raised, pending writes are put back to how they were on entry, and the exception re-raised.
+        """
+        with self._lock:
+            pending, sections = dict(self._pending), set(self._sections)
+        try:
+            yield self
+        except BaseException:
+            with self._lock:
+                self._pending, self._sections = pending, sections
+            raise
+        self.commit()
+
+    def rollback(self):
+        """Discard pending writes.
+
+        """
+        with self._lock:
+            self._pending.clear()
+
+    def frozen(self):
+        """Stop any further writes to the store, without copying it.
+
+        """
+        self.is_frozen = True
+        return self
+
+    def close(self):
+        self.connection.close()
+
+    def __repr__(self):
+        return "<{}: table {}{}>".format(self.__class__.__name__, self.table, ' (frozen)' if self.is_frozen else '')
@@ -0,0 +1,745 @@
+"""
+Container classes that can be used as `Bonfig` stores, in place of plain `dict` s.
+
+Any container will work as a store as long as it supports `__getitem__` (and `keys()` to be frozen), the classes here
+add extra behaviour on top of that, such as sharing data between many `Bonfig` instances.
+"""
+
+import abc
+import collections
+import collections.abc
+import configparser
+import re
+import threading
+import types
+
+from bonfig.fields import MISSING, _dict_keys_get
+
+
+def _is_mapping(obj):
+    """Check if `obj` looks enough like a mapping to be treated as one.
+
+    """
+    return hasattr(obj, '__getitem__') and hasattr(obj, 'keys')
+
+
+def _freeze(mapping):
+    from bonfig.core import _freeze_mapping
+    return _freeze_mapping(mapping)
+
+
+def _replace_path(mapping, keys, value):
+    from bonfig.core import _replace_path
+    return _replace_path(mapping, keys, value)
+
+
+_EMPTY = types.MappingProxyType({})
+
+_DELETED = object()
+
+
+class BaseStore(collections.abc.MutableMapping):
+    """
+    Base class for custom store containers.
+
+    Subclasses must implement the `MutableMapping` interface, and :py:meth:`BaseStore.frozen`, which is used by
+    :py:meth:`Bonfig.freeze` instead of copying the store's contents into nested `MappingProxyType` s.
+
+    Attributes
+    ----------
+    section_type : type
+        Type used to create new (empty) sections when initialising `Field` s, default `dict`.
+    """
+    __slots__ = ()
+
+    section_type = dict
+
+    @abc.abstractmethod
+    def frozen(self):
+        """Return an immutable version of this store.
+
+        """
+
+    def replaced(self, writes):
+        """Return a frozen store with `writes` applied, used when editing frozen `Bonfig` s (see
+        :py:meth:`Bonfig.edit`).
+
+        By default, frozen stores can't be edited, and this raises `TypeError`.
+
+        Parameters
+        ----------
+        writes : iterable
+            Pairs of key paths (tuples of keys) and the values to write to them. A value of `MISSING` removes the
+            value at its path instead.
+        """
+        raise TypeError("Frozen '{}' objects can't be edited".format(self.__class__.__name__))
+
+
+class OverlayStore(BaseStore):
+    """
+    Store that layers a small set of per-instance overrides on top of a shared, frozen base mapping.
+
+    Nothing in `base` is ever copied. Sections of `base` are only wrapped in their own `OverlayStore` when they are
+    accessed from an unfrozen store (i.e. copy-on-write at `Section` granularity), and
+    :py:meth:`OverlayStore.frozen` drops any of those that ended up with no overrides, such that the memory used by a
+    frozen instance scales with the size of its overrides, rather than the size of `base`.
+
+    Parameters
+    ----------
+    base : Mapping, optional
+        Shared data to use for any keys that aren't overridden. If this isn't already a `MappingProxyType` it'll be
+        frozen first, so to share one base between many stores, freeze it once up front.
+    overrides : Mapping, optional
+        Nested mapping of values to override, merged into `base` section by section.
+
+    Examples
+    --------
+    >>> BASE = _freeze_mapping({'db': {'host': 'localhost', 'port': '5432'}, 'log': {'level': 'INFO'}})
+    >>> class Config(Bonfig):
+    ...     s = Store()
+    ...     host = s.Section('db').Field()
+    ...     level = s.Section('log').Field()
+    ...
+    ...     def load(self, tenant):
+    ...         self.s = OverlayStore(BASE, {'db': {'host': tenant + '.db'}})
+    >>> c = Config('acme')
+    >>> c.host
+    'acme.db'
+    >>> c.s['log'] is BASE['log']
+    True
+    """
+    __slots__ = ('base', 'overlay', 'is_frozen')
+
+    def __init__(self, base=None, overrides=None):
+        if base is None:
+            base = _EMPTY
+        elif not isinstance(base, types.MappingProxyType):
+            base = _freeze(base)
+        self.base = base
+        self.overlay = {}
+        self.is_frozen = False
+
+        if overrides is not None:
+            self.merge(overrides)
+
+    def merge(self, overrides):
+        """Recursively merge nested mapping `overrides` into this store.
+
+        """
+        for key, value in overrides.items():
+            if _is_mapping(value) and key in self:
+                current = self[key]
+                if isinstance(current, OverlayStore):
+                    current.merge(value)
+                    continue
+            self[key] = value
+
+    def __getitem__(self, key):
+        try:
+            value = self.overlay[key]
+        except KeyError:
+            value = self.base[key]
+            if not self.is_frozen and _is_mapping(value):
+                value = self.overlay[key] = OverlayStore(value)
+            return value
+        if value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if self.is_frozen:
+            raise TypeError("'{}' object does not support item assignment".format(self.__class__.__name__))
+        self.overlay[key] = value
+
+    def __delitem__(self, key):
+        if self.is_frozen:
+            raise TypeError("'{}' object does not support item deletion".format(self.__class__.__name__))
+        if key not in self:
+            raise KeyError(key)
+        if key in self.base:
+            self.overlay[key] = _DELETED
+        else:
+            del self.overlay[key]
+
+    def __iter__(self):
+        overlay = self.overlay
+        for key in self.base:
+            if overlay.get(key) is not _DELETED:
+                yield key
+        for key, value in overlay.items():
+            if value is not _DELETED and key not in self.base:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        value = self.overlay.get(key)
+        if value is None:
+            return key in self.overlay or key in self.base
+        return value is not _DELETED
+
+    def frozen(self):
+        """Return a frozen `OverlayStore` sharing `self.base`, holding only sections with overrides.
+
+        """
+        overlay = {}
+        for key, value in self.overlay.items():
+            if isinstance(value, OverlayStore):
+                if not value.overlay and key in self.base and value.base is self.base[key]:
+                    continue  # untouched section, fall through to base
+                value = value.frozen()
+            elif value is not _DELETED and _is_mapping(value):
+                value = _freeze(value)
+            overlay[key] = value
+
+        store = OverlayStore(self.base)
+        store.overlay = overlay
+        store.is_frozen = True
+        return store
+
+    def replaced(self, writes):
+        """Return a frozen `OverlayStore` sharing `self.base`, with `writes` applied to its overrides.
+
+        """
+        store = OverlayStore(self.base)
+        store.overlay = dict((self if self.is_frozen else self.frozen()).overlay)
+        store.is_frozen = True
+
+        for keys, value in writes:
+            key, rest = keys[0], keys[1:]
+            if not rest:
+                if value is not MISSING:
+                    store.overlay[key] = _freeze(value) if _is_mapping(value) else value
+                elif key in store.base:
+                    store.overlay[key] = _DELETED
+                else:
+                    store.overlay.pop(key, None)
+                continue
+
+            current = store.overlay.get(key, MISSING)
+            if current is MISSING and _is_mapping(store.base.get(key)):
+                current = OverlayStore(store.base[key]).frozen()
+            if isinstance(current, OverlayStore):
+                store.overlay[key] = current.replaced([(rest, value)])
+            else:
+                store.overlay[key] = _replace_path(current if _is_mapping(current) else _EMPTY, rest, value)
+        return store
+
+    def __repr__(self):
+        return "<{}: {} overrides on {} base keys{}>".format(self.__class__.__name__,
+                                                              len(self.overlay),
+                                                              len(self.base),
+                                                              ' (frozen)' if self.is_frozen else '')
+
+
+class _VersionedSection(BaseStore):
+    """Mutable view of a section within a :py:class:`VersionedStore`, which writes through to the store.
+
+    """
+    __slots__ = ('store', 'path')
+
+    def __init__(self, store, path):
+        self.store = store
+        self.path = path
+
+    def _current(self):
+        d = self.store.root
+        for key in self.path:
+            d = d[key]
+        return d
+
+    def __getitem__(self, key):
+        value = self._current()[key]
+        if isinstance(value, types.MappingProxyType):
+            return _VersionedSection(self.store, self.path + (key,))
+        return value
+
+    def __setitem__(self, key, value):
+        self.store.set_in(self.path + (key,), value)
+
+    def __delitem__(self, key):
+        self.store.delete_in(self.path + (key,))
+
+    def __iter__(self):
+        return iter(self._current())
+
+    def __len__(self):
+        return len(self._current())
+
+    def frozen(self):
+        return self._current()
+
+    def __repr__(self):
+        return "<{}: {} in {!r}>".format(self.__class__.__name__, list(self.path), self.store)
+
+
+class VersionedStore(BaseStore):
+    """
+    Persistent store, where every write creates a new, immutable version of its contents.
+
+    Each version is a tree of nested `MappingProxyType` s. Writes only re-create the sections on the path to the key
+    written to, sharing the rest with the previous version, so keeping many versions around is cheap. Old versions
+    can be retrieved with :py:meth:`VersionedStore.snapshot`, and restored with :py:meth:`VersionedStore.rollback`.
+
+    When frozen, writes through `__setitem__` raise `TypeError`, but new versions can still be loaded using
+    :py:meth:`VersionedStore.load`.
+
+    Parameters
+    ----------
+    data : Mapping, optional
+        Initial contents of the store.
+    max_versions : int, optional
+        Number of versions to keep, older versions are discarded. `None` means keep them all.
+
+    Examples
+    --------
+    >>> class Config(Bonfig):
+    ...     s = Store()
+    ...     a = s.Field()
+    ...
+    ...     def load(self):
+    ...         self.s = VersionedStore({'a': 'one'})
+    >>> c = Config()
+    >>> c.s.load({'a': 'two'})
+    2
+    >>> c.a
+    'two'
+    >>> c.rollback()
+    >>> c.a
+    'one'
+    """
+    __slots__ = ('_history', '_next', '_lock', '_amending', 'is_frozen')
+
+    def __init__(self, data=None, max_versions=10):
+        root = _freeze(data) if data is not None else _EMPTY
+        self._history = collections.deque([(1, root)], maxlen=max_versions)
+        self._next = 2
+        self._lock = threading.Lock()
+        self._amending = False
+        self.is_frozen = False
+
+    @property
+    def root(self):
+        """Contents of the current version.
+
+        """
+        return self._history[-1][1]
+
+    @property
+    def version(self):
+        """Number of the current version.
+
+        """
+        return self._history[-1][0]
+
+    @property
+    def versions(self):
+        """Numbers of all versions being kept, oldest first.
+
+        """
+        return [version for version, root in self._history]
+
+    def _commit(self, root):
+        """Add `root` as a new version, or replace the current version with it while `_amending`.
+
+        Must be called holding `_lock`, having built `root` from the current version while holding it.
+        """
+        if self._amending:
+            version = self._history[-1][0]
+            self._history[-1] = (version, root)
+            return version
+        version = self._next
+        self._next += 1
+        self._history.append((version, root))
+        return version
+
+    def _check_frozen(self):
+        if self.is_frozen:
+            raise TypeError("'{}' object does not support item assignment".format(self.__class__.__name__))
+
+    def set_in(self, keys, value):
+        """Create a new version with `value` set at path `keys`.
+
+        """
+        self._check_frozen()
+        if _is_mapping(value):
+            value = _freeze(dict(value))
+        with self._lock:
+            return self._commit(_replace_path(self.root, keys, value))
+
+    def delete_in(self, keys):
+        """Create a new version with the value at path `keys` removed.
+
+        """
+        self._check_frozen()
+        with self._lock:
+            _dict_keys_get(self.root, keys)  # raises KeyError if missing
+            return self._commit(_replace_path(self.root, keys, MISSING))
+
+    def load(self, data):
+        """Replace the contents of the store with `data`, as a new version.
+
+        Returns
+        -------
+        version : int
+            Number of the new version.
+        """
+        root = _freeze(data)
+        with self._lock:
+            return self._commit(root)
+
+    def snapshot(self, version=None):
+        """Get the contents of the store at `version`, or the current version if `None`.
+
+        As versions are immutable, the snapshot will never change, even if the store is written to or rolled back.
+        """
+        if version is None:
+            return self.root
+        for number, root in self._history:
+            if number == version:
+                return root
+        raise KeyError("Version {} not found".format(version))
+
+    def rollback(self, version=None):
+        """Restore the store to `version`, discarding all versions after it.
+
+        By default, rolls back to the previous version.
+        """
+        with self._lock:
+            if version is None:
+                if len(self._history) < 2:
+                    raise KeyError("No previous version to roll back to")
+                version = self._history[-2][0]
+            if version not in self.versions:
+                raise KeyError("Version {} not found".format(version))
+            while self._history[-1][0] != version:
+                self._history.pop()
+
+    def __getitem__(self, key):
+        value = self.root[key]
+        if not self.is_frozen and isinstance(value, types.MappingProxyType):
+            return _VersionedSection(self, (key,))
+        return value
+
+    def __setitem__(self, key, value):
+        self.set_in((key,), value)
+
+    def __delitem__(self, key):
+        self.delete_in((key,))
+
+    def __iter__(self):
+        return iter(self.root)
+
+    def __len__(self):
+        return len(self.root)
+
+    def frozen(self):
+        """Mark store as frozen, keeping the same history.
+
+        """
+        self.is_frozen = True
+        return self
+
+    def replaced(self, writes):
+        """Apply `writes` as a single new version, returning this store.
+
+        As with :py:meth:`VersionedStore.load`, this works even if the store is frozen, so every `Bonfig` using the
+        store sees the new version, other than snapshots (see :py:meth:`Bonfig.snapshot`).
+        """
+        writes = [(keys, _freeze(dict(value)) if _is_mapping(value) else value) for keys, value in writes]
+        with self._lock:
+            root = self.root
+            for keys, value in writes:
+                root = _replace_path(root, keys, value)
+            self._commit(root)
+        return self
+
+    def __repr__(self):
+        return "<{}: version {} of {}{}>".format(self.__class__.__name__, self.version, self.versions,
+                                                  ' (frozen)' if self.is_frozen else '')
+
+
+_BASIC_REF = re.compile(r"%\(([^)]+)\)s")
+_EXTENDED_REF = re.compile(r"\$\{([^}]+)\}")
+
+
+class _IniSection(dict):
+    """Section of an :py:class:`IniStore`. Reads are plain `dict` lookups, writes go through the store.
+
+    """
+    __slots__ = ('store', 'name')
+
+    def __init__(self, store, name, values):
+        super().__init__(values)
+        self.store = store
+        self.name = name
+
+    def __missing__(self, key):
+        normalised = self.store.optionxform(key)
+        if normalised == key:
+            raise KeyError(key)
+        return self[normalised]
+
+    def __setitem__(self, key, value):
+        self.store.set(self.name, key, value)
+
+    def __delitem__(self, key):
+        raise TypeError("Options can't be removed from an IniStore")
+
+
+class IniStore(BaseStore):
+    """
+    Snapshot of a `configparser.ConfigParser`, with all interpolation resolved up front.
+
+    Reading from a `ConfigParser` runs interpolation every time a value is read. Instead, `IniStore` resolves every
+    value once when it's created, using a dependency graph of the references between values, such that sections are
+    plain `dict` s, and reads are plain lookups. When a value is written, only values that depend on it (directly or
+    indirectly) are resolved again.
+
+    Both `configparser.BasicInterpolation` (``%(key)s``) and `configparser.ExtendedInterpolation` (``${key}`` and
+    ``${section:key}``) are supported. For other interpolation types, values are resolved once by the parser, and not
+    updated on writes.
+
+    Parameters
+    ----------
+    parser : configparser.RawConfigParser
+        Parser to take snapshot of. It isn't kept or modified.
+
+    Raises
+    ------
+    configparser.InterpolationError
+        If any value references one that doesn't exist, or values reference each other in a cycle.
+
+    Examples
+    --------
+    >>> class Config(Bonfig):
+    ...     ini = Store()
+    ...     A = ini.Section()
+    ...     url = A.Field()
+    ...
+    ...     def load(self):
+    ...         parser = configparser.ConfigParser()
+    ...         parser.read_string("[A]\nhost = localhost\nurl = http://%(host)s/")
+    ...         self.ini = IniStore(parser)
+    >>> Config().url
+    'http://localhost/'
+    """
+
+    def __init__(self, parser):
+        self.optionxform = parser.optionxform
+        self.default_section = parser.default_section
+
+        interpolation = getattr(parser, '_interpolation', None)
+        if isinstance(interpolation, configparser.ExtendedInterpolation):
+            self._parse = self._parse_extended
+        elif isinstance(interpolation, configparser.BasicInterpolation):
+            self._parse = self._parse_basic
+        elif interpolation is None or type(interpolation) is configparser.Interpolation:
+            self._parse = None
+        else:
+            self._parse = False
+
+        self._raw = {self.default_section: dict(parser.defaults())}
+        for section in parser.sections():
+            self._raw[section] = dict(parser.items(section, raw=True))
+
+        # options each section sets itself, rather than inheriting from the default section
+        own = getattr(parser, '_sections', None)
+        if own is None:
+            own = {section: set(self._raw[section]) - set(parser.defaults()) for section in parser.sections()}
+        self._own = {section: set(own[section]) for section in parser.sections()}
+
+        if self._parse is False:  # unsupported interpolation, let the parser do it once
+            resolved = {section: dict(parser.items(section)) for section in parser.sections()}
+            resolved[self.default_section] = {k: parser.get(self.default_section, k) for k in parser.defaults()}
+            self._sections = {name: _IniSection(self, name, values) for name, values in resolved.items()}
+            return
+
+        self._build()
+
+    def _parse_basic(self, section, option, raw):
+        parts, i = [], 0
+        while True:
+            j = raw.find('%', i)
+            if j < 0:
+                parts.append(raw[i:])
+                return parts
+            parts.append(raw[i:j])
+            if raw.startswith('%%', j):
+                parts.append('%')
+                i = j + 2
+                continue
+            m = _BASIC_REF.match(raw, j)
+            if m is None:
+                raise configparser.InterpolationSyntaxError(
+                    option, section, "'%' must be followed by '%' or '(', found: {!r}".format(raw[j:]))
+            parts.append((section, self.optionxform(m.group(1))))
+            i = m.end()
+
+    def _parse_extended(self, section, option, raw):
+        parts, i = [], 0
+        while True:
+            j = raw.find('$', i)
+            if j < 0:
+                parts.append(raw[i:])
+                return parts
+            parts.append(raw[i:j])
+            if raw.startswith('$$', j):
+                parts.append('$')
+                i = j + 2
+                continue
+            m = _EXTENDED_REF.match(raw, j)
+            if m is None:
+                raise configparser.InterpolationSyntaxError(
+                    option, section, "'$' must be followed by '$' or '{{', found: {!r}".format(raw[j:]))
+            path = m.group(1).split(':')
+            if len(path) == 1:
+                parts.append((section, self.optionxform(path[0])))
+            elif len(path) == 2:
+                parts.append((path[0], self.optionxform(path[1])))
+            else:
+                raise configparser.InterpolationSyntaxError(
+                    option, section, "More than one ':' found: {!r}".format(raw))
+            i = m.end()
+
+    def _build(self):
+        """Parse every raw value and resolve them all, in dependency order.
+
+        """
+        self._parts, self._dependents = {}, collections.defaultdict(set)
+        for section, options in self._raw.items():
+            for option, raw in options.items():
+                self._add_node(section, option, raw)
+
+        self._values = {}
+        for node in self._parts:
+            try:
+                self._resolve(node, set())
+            except configparser.InterpolationError:
+                # values in the default section are only ever resolved within the context of other sections
+                if node[0] != self.default_section:
+                    raise
+
+        self._sections = {}
+        for section, options in self._raw.items():
+            values = {option: self._values[(section, option)] for option in options
+                      if (section, option) in self._values}
+            self._sections[section] = _IniSection(self, section, values)
+
+    def _add_node(self, section, option, raw):
+        node = (section, option)
+        parts = self._parse(section, option, raw) if self._parse is not None and raw is not None else [raw]
+        self._parts[node] = parts
+        for part in parts:
+            if isinstance(part, tuple):
+                self._dependents[part].add(node)
+
+    def _resolve(self, node, stack):
+        if node in self._values:
+            return self._values[node]
+        section, option = node
+        if node in stack:
+            raise configparser.InterpolationDepthError(option, section, self._raw[section][option])
+
+        stack.add(node)
+        resolved = []
+        for part in self._parts[node]:
+            if isinstance(part, tuple):
+                if part not in self._parts:
+                    raise configparser.InterpolationMissingOptionError(option, section,
+                                                                       self._raw[section][option], part[1])
+                resolved.append(self._resolve(part, stack))
+            else:
+                resolved.append(part)
+        stack.discard(node)
+
+        value = self._values[node] = resolved[0] if len(resolved) == 1 else ''.join(resolved)
+        return value
+
+    def _remove_node(self, node):
+        for part in self._parts.pop(node, ()):
+            if isinstance(part, tuple):
+                self._dependents[part].discard(node)
+
+    def set(self, section, option, value):
+        """Set the raw value of `option` in `section`, then resolve it and all values that depend on it again.
+
+        If this would leave any value unresolvable, the write is undone and the `configparser.InterpolationError`
+        raised.
+        """
+        option = self.optionxform(option)
+        if section not in self._raw:
+            raise KeyError(section)
+        if self._parse is False:
+            raise TypeError("Can't write to an IniStore using unsupported interpolation")
+
+        if section == self.default_section:  # could be inherited by any section, so rebuild everything
+            backup = {name: dict(options) for name, options in self._raw.items()}
+            for name, options in self._raw.items():
+                if name == section or option not in self._own[name]:
+                    options[option] = value
+            try:
+                self._build()
+            except configparser.InterpolationError:
+                self._raw = backup
+                self._build()
+                raise
+            return
+
+        node = (section, option)
+        old = self._raw[section].get(option, MISSING)
+        self._remove_node(node)
+        self._raw[section][option] = value
+        self._add_node(section, option, value)
+        owned = option in self._own[section]
+        self._own[section].add(option)
+
+        stale, queue = set(), [node]
+        while queue:
+            current = queue.pop()
+            if current not in stale:
+                stale.add(current)
+                queue.extend(self._dependents.get(current, ()))
+
+        previous = {n: self._values.pop(n) for n in stale if n in self._values}
+        try:
+            for n in stale:
+                self._resolve(n, set())
+        except configparser.InterpolationError:
+            self._remove_node(node)
+            if not owned:
+                self._own[section].discard(option)
+            if old is MISSING:
+                del self._raw[section][option]
+            else:
+                self._raw[section][option] = old
+                self._add_node(section, option, old)
+            for n in stale:
+                self._values.pop(n, None)
+            self._values.update(previous)
+            raise
+
+        for s, o in stale:
+            dict.__setitem__(self._sections[s], o, self._values[(s, o)])
+
+    def __getitem__(self, section):
+        return self._sections[section]
+
+    def __setitem__(self, section, options):
+        raise TypeError("Sections can't be added to an IniStore")
+
+    def __delitem__(self, section):
+        raise TypeError("Sections can't be removed from an IniStore")
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __len__(self):
+        return len(self._sections)
+
+    def frozen(self):
+        return _freeze(self._sections)
+
+    def __repr__(self):
+        return "<{}: {}>".format(self.__class__.__name__, list(self._sections))
@@ -1,6 +1,7 @@
 import pytest
 import datetime
 import pathlib
+import sys
 
 from bonfig import Bonfig, Store
 from bonfig.fields import fields, Field, Section
@@ -348,3 +349,1567 @@ def test_freeze():
 
     with pytest.raises(TypeError):
         c.c = 'not c'
+
+
+def test_compact_declarations():
+    class Config(Bonfig):
+        s = Store()
+        A = s.Section()
+        a = A.IntField(1)
+        b = s.Field('b')
+
+    for obj in (Config.s, Config.A, Config.a, Config.b):
+        assert not hasattr(obj, '__dict__')
+
+    assert Config.s.Field is Config.s.Field
+    assert Config.A.IntField is Config.A.IntField
+    assert Config.a._key_path == ('A', 'a')
+    assert Config.a.keys == ['A', 'a']
+
+    c = Config()
+    assert c.a == 1
+    assert c.b == 'b'
+
+
+def test_overlay_store():
+    from bonfig.core import _freeze_mapping
+    from bonfig.stores import OverlayStore
+
+    base = _freeze_mapping({'A': {'a': 'base a', 'b': 'base b'},
+                            'B': {'c': 'base c', 'C': {'d': 'base d'}}})
+
+    class Config(Bonfig):
+        s = Store()
+        A = s.Section()
+        a = A.Field()
+        b = A.Field()
+        B = s.Section()
+        c = B.Field()
+        C = B.Section()
+        d = C.Field()
+        e = C.Field('init e')
+
+        def load(self, overrides=None):
+            self.s = OverlayStore(base, overrides)
+
+    c1 = Config({'A': {'a': 'one a'}})
+    c2 = Config()
+
+    assert c1.a == 'one a'
+    assert c1.b == 'base b'
+    assert c2.a == 'base a'
+    assert c1.d == c2.d == 'base d'
+    assert c1.e == 'init e'
+
+    assert c1.s['A'] is not base['A']
+    assert c1.s['B'] is not base['B']  # modified by e's initialisation
+    assert c1.s['B']['c'] == 'base c'
+    assert set(c1.s['B']['C'].keys()) == {'d', 'e'}
+    assert base['B']['C'] == {'d': 'base d'}
+
+    assert c1.s.overlay.keys() == {'A', 'B'}
+
+    with pytest.raises(TypeError):
+        c1.a = 'changed'
+
+    class Plain(Bonfig):
+        s = Store()
+        a = s.Section('A').Field()
+
+        def load(self):
+            self.s = OverlayStore(base)
+
+    p = Plain()
+    assert p.s['B'] is base['B']
+    assert p.s.overlay == {}
+    assert p.a == 'base a'
+
+    u = Plain(frozen=False)
+    u.a = 'changed'
+    assert u.a == 'changed'
+    assert base['A']['a'] == 'base a'
+    del u.s['B']
+    assert set(u.s) == {'A'}
+
+
+def test_cached(tmp_path):
+    import json
+    import threading
+    import time
+    from bonfig.cache import InstanceCache
+
+    loads = []
+
+    class Config(Bonfig):
+        __instance_cache__ = InstanceCache(maxsize=2)
+        s = Store()
+        a = s.Field()
+
+        def load(self, key):
+            loads.append(key)
+            self.s = {'a': '-'.join(key)}
+
+    c = Config.cached(('acme', 'prod'))
+    assert c.a == 'acme-prod'
+    assert Config.cached(('acme', 'prod')) is c
+    assert Config.__instance_cache__.stats.hits == 1
+    assert Config.__instance_cache__.stats.misses == 1
+
+    Config.cached(('acme', 'dev'))
+    Config.cached(('other', 'dev'))
+    assert Config.__instance_cache__.stats.evictions == 1
+    assert Config.cached(('acme', 'prod')) is not c  # evicted as least recently used
+
+    with pytest.raises(ValueError, match='frozen'):
+        Config.cached(('unfrozen', ''), loader=lambda key: Config(key, frozen=False))
+
+    # ttl
+    now = [0]
+    cache = InstanceCache(ttl=10, timer=lambda: now[0])
+    first = cache.get('k', lambda: Config(('t', 't')))
+    assert cache.get('k', lambda: Config(('t', 't'))) is first
+    now[0] = 11
+    assert cache.get('k', lambda: Config(('t', 't'))) is not first
+
+    # memory budget
+    cache = InstanceCache(maxsize=None, max_bytes=1)
+    cache.get('k', lambda: Config(('t', 't')))
+    assert len(cache) == 0
+
+    # source invalidation
+    fn = tmp_path / 'config.json'
+    fn.write_text(json.dumps({'a': 'one'}))
+
+    class FileConfig(Bonfig):
+        s = Store()
+        a = s.Field()
+
+        def load(self, key):
+            self.s = json.loads(fn.read_text())
+
+    c = FileConfig.cached('file', sources=[str(fn)])
+    assert FileConfig.cached('file', sources=[str(fn)]) is c
+    fn.write_text(json.dumps({'a': 'two, changed'}))
+    assert FileConfig.cached('file', sources=[str(fn)]).a == 'two, changed'
+
+    # single flight
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return Config(('slow', 'load'))
+
+    cache = InstanceCache()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('slow', slow_loader))) for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert all(r is results[0] for r in results)
+    assert cache.stats.misses == 1
+
+
+def test_diff_and_patch():
+    from bonfig.core import MISSING
+
+    class Config(Bonfig):
+        s = Store()
+        A = s.Section()
+        a = A.Field()
+        b = A.Field()
+        B = s.Section()
+        c = B.Field()
+        d = s.IntField()
+
+        def load(self, **values):
+            self.s = {'A': {'a': values.get('a', 'a'), 'b': 'b'},
+                      'B': {'c': values.get('c', 'c')},
+                      'd': '1'}
+            if 'extra' in values:
+                self.s['extra'] = {'x': values['extra']}
+
+    c1 = Config()
+    c2 = Config(c='changed', extra='new')
+
+    assert c1.diff(c1) == []
+
+    changes = c1.diff(c2)
+    assert len(changes) == 2
+    by_path = {change.path: change for change in changes}
+    assert by_path[('s', 'B', 'c')].field is Config.c
+    assert by_path[('s', 'B', 'c')].old == 'c'
+    assert by_path[('s', 'B', 'c')].new == 'changed'
+    assert by_path[('s', 'extra')].field is None
+    assert by_path[('s', 'extra')].old is MISSING
+
+    patched = c1.apply_patch(changes)
+    assert patched is not c1
+    assert patched._frozen
+    assert patched.c == 'changed'
+    assert c1.c == 'c'
+    assert patched.s['extra'] == {'x': 'new'}
+    assert patched.s['A'] is c1.s['A']
+    assert patched.diff(c2) == []
+    assert c1.diff(patched)[0].path in by_path
+
+    reverted = patched.apply_patch(patched.diff(c1))
+    assert 'extra' not in reverted.s
+    assert reverted.diff(c1) == []
+
+    u = Config(frozen=False)
+    assert u.apply_patch(changes) is u
+    assert u.c == 'changed'
+    assert u.s['extra'] == {'x': 'new'}
+
+
+def test_subscribe():
+    class Config(Bonfig):
+        s = Store()
+        A = s.Section()
+        a = A.Field('a')
+        b = A.Field('b')
+        c = s.IntField(1)
+
+    c = Config(frozen=False)
+
+    everything, section, field = [], [], []
+    c.subscribe(everything.append)
+    c.subscribe(section.append, Config.A)
+    unsubscribe = c.subscribe(field.append, Config.c)
+
+    c.a = 'one'
+    assert len(everything) == 1
+    assert everything[0][0].path == ('s', 'A', 'a')
+    assert everything[0][0].field is Config.a
+    assert everything[0][0].old == 'a'
+    assert everything[0][0].new == 'one'
+    assert len(section) == 1
+    assert field == []
+
+    with c.batch():
+        for i in range(100):
+            c.c = i
+            c.a = str(i)
+            c.b = str(i)
+        assert len(everything) == 1
+
+    assert len(everything) == 2
+    assert len(everything[1]) == 3
+    assert len(section) == 2
+    assert {ch.path for ch in section[1]} == {('s', 'A', 'a'), ('s', 'A', 'b')}
+    assert len(field) == 1
+    assert field[0][0].old == '1'
+    assert field[0][0].new == '99'
+
+    unsubscribe()
+    c.c = 5
+    assert len(field) == 1
+    assert len(everything) == 3
+
+    frozen = Config()
+    original = []
+    frozen.subscribe(original.append)
+    patched = frozen.apply_patch(frozen.diff(c))
+    copied = []
+    patched.subscribe(copied.append)
+    assert frozen._subscribers == [((), original.append)]
+    assert patched._pending is None and frozen._pending is None
+
+
+def test_edit():
+    class Config(Bonfig):
+        s = Store()
+        A = s.Section()
+        a = A.Field('a')
+        n = A.IntField(1)
+        B = s.Section()
+        b = B.Field('b')
+
+    c = Config()
+    old_store = c.s
+
+    with c.edit() as tx:
+        tx.a = 'new a'
+        tx.n = 5
+        assert tx.n == 5
+        assert tx.b == 'b'
+        assert c.a == 'a'
+
+    d = tx.result
+    assert (c.a, c.n) == ('a', 1)
+    assert c.s is old_store
+    assert (d.a, d.n) == ('new a', 5)
+    assert d.s['B'] is old_store['B']
+
+    with pytest.raises(TypeError):
+        d.a = 'not allowed'
+
+    with pytest.raises(ValueError, match='n'):
+        with d.edit() as tx:
+            tx.a = 'rejected'
+            tx.n = 'not an int'
+
+    assert d.a == 'new a'
+    assert tx.result is None
+
+    with pytest.raises(AttributeError):
+        with c.edit() as tx:
+            tx.not_a_field = 1
+
+    u = Config(frozen=False)
+    notified = []
+    u.subscribe(notified.append)
+    with u.edit() as tx:
+        tx[Config.b] = 'new b'
+        tx.n = 2
+    assert u.b == 'new b'
+    assert tx.result is u
+    assert len(notified) == 1
+    assert len(notified[0]) == 2
+
+
+def test_edit_base_stores():
+    from bonfig.core import _freeze_mapping
+    from bonfig.stores import OverlayStore, VersionedStore
+
+    base = _freeze_mapping({'A': {'a': 'one', 'n': '1'}, 'B': {'b': 'two'}})
+
+    class Config(Bonfig):
+        s = Store()
+        a = s.Section('A').Field()
+        n = s.Section('A').IntField()
+        b = s.Section('B').Field()
+
+        def load(self, store):
+            self.s = store
+
+    c = Config(OverlayStore(base, {'A': {'n': '2'}}))
+    with c.edit() as tx:
+        tx.a = 'new'
+    d = tx.result
+    assert isinstance(d.s, OverlayStore) and d.s.base is base
+    assert (d.a, d.n, d.b) == ('new', 2, 'two')
+    assert (c.a, c.n) == ('one', 2)
+    assert d.s['B'] is base['B']
+
+    store = VersionedStore(base)
+    c = Config(store)
+    pinned = c.snapshot()
+    with c.edit() as tx:
+        tx.a = 'new'
+        tx.n = 3
+    assert tx.result.s is store
+    assert store.versions == [1, 2]
+    assert (tx.result.a, tx.result.n) == ('new', 3)
+    assert (c.a, c.n) == ('new', 3)  # c shares the store, so sees the new version
+    assert (pinned.a, pinned.n) == ('one', 1)
+    assert store.snapshot(1)['A']['a'] == 'one'
+
+
+def test_versioned_store():
+    import threading
+    from bonfig.stores import VersionedStore
+
+    class Config(Bonfig):
+        s = Store()
+        A = s.Section()
+        a = A.Field()
+        b = A.Field()
+        B = s.Section()
+        c = B.Field('init c')
+
+        def load(self):
+            self.s = VersionedStore({'A': {'a': 'one', 'b': 'b'}, 'B': {}})
+
+    c = Config(frozen=False)
+    assert c.c == 'init c'
+    assert c.history() == {'s': [1]}
+
+    first = c.s.snapshot()
+    pinned = c.snapshot()
+    c.a = 'two'
+    assert c.a == 'two'
+    assert pinned.a == 'one'
+    assert first['A']['a'] == 'one'
+    assert c.s.root['B'] is first['B']  # structurally shared
+
+    c.rollback()
+    assert c.a == 'one'
+    assert c.history() == {'s': [1]}
+
+    class Mixed(Config):
+        t = Store()
+        d = t.Field('d')
+
+        def load(self):
+            super().load()
+            self.t = {}
+
+    m = Mixed(frozen=False)
+    snap = m.snapshot()
+    with pytest.raises(TypeError):
+        snap.d = 'changed'
+    m.d = 'changed'
+    assert (snap.d, m.d) == ('d', 'changed')
+
+    c.freeze()
+    with pytest.raises(TypeError):
+        c.a = 'three'
+
+    version = c.s.load({'A': {'a': 'reloaded'}})
+    assert c.a == 'reloaded'
+    assert version == 3
+    c.rollback({'s': 1})
+    assert c.a == 'one'
+    assert c.c == 'init c'
+
+    with pytest.raises(KeyError):
+        c.rollback(100)
+
+    limited = VersionedStore({'a': '0'}, max_versions=3)
+    for i in range(10):
+        limited['a'] = str(i)
+    assert limited.versions == [9, 10, 11]
+
+    class Valued(Bonfig):
+        s = Store()
+        a = s.Section('A').Field('a')
+        b = s.Section('B').Field('b')
+        c = s.Field('c')
+
+        def load(self):
+            self.s = VersionedStore({}, max_versions=2)
+
+    assert Valued().history() == {'s': [1]}
+
+    def write(n):
+        for i in range(1000):
+            store['t{}'.format(n)] = str(i)
+            store.replaced([(('r{}'.format(n),), str(i))])
+
+    store = VersionedStore()
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.version == 16001
+    assert all(store['t{}'.format(n)] == store['r{}'.format(n)] == '999' for n in range(8))
+
+
+def test_datetime_parsing():
+    from bonfig.fields import _compile_datetime_fmt
+
+    for fmt, val in [('%d/%m/%Y', '25/12/1995'),
+                     ('%d/%m/%y', '25/12/95'),
+                     ('%d/%m/%y', '01/01/68'),
+                     ('%Y-%m-%dT%H:%M:%S', '2020-02-29T23:59:01'),
+                     ('%d/%m/%Y', '1/2/2000'),  # not fixed width, falls back to strptime
+                     ('%b %d %Y', 'Dec 25 1995')]:
+        assert _compile_datetime_fmt(fmt)(val) == datetime.datetime.strptime(val, fmt)
+
+    with pytest.raises(ValueError):
+        _compile_datetime_fmt('%Y-%m-%d')('2019-02-29')
+
+    with pytest.raises(ValueError):
+        _compile_datetime_fmt('%Y-%m-%d')('not a date')
+
+    when = datetime.datetime(1995, 12, 25, 9, 30)
+
+    class Config(Bonfig):
+        s = Store()
+        a = s.DatetimeField('25/12/1995', fmt='%d/%m/%Y')
+        b = s.IsoDatetimeField(when)
+        c = s.IsoDatetimeField('1995-12-25T09:30:00')
+
+    c = Config()
+    assert c.a == datetime.datetime(1995, 12, 25)
+    assert c.b == when
+    assert c.c == when
+    assert c.s['b'] == '1995-12-25T09:30:00'
+
+
+def test_profile_cli(tmp_path, monkeypatch, capsys):
+    import json
+    from bonfig.__main__ import main
+
+    (tmp_path / 'profiled_config.py').write_text(
+        "from bonfig import Bonfig, Store\n"
+        "class Config(Bonfig):\n"
+        "    s = Store()\n"
+        "    a = s.IntField(1)\n"
+        "    b = s.Field()\n"
+        "    missing = s.Field()\n"
+        "    def load(self, b='b'):\n"
+        "        self.s = {'b': b}\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    main(['profiled_config:Config', '--kwarg', 'b=from cli', '--json', '--repeat', '10'])
+    report = json.loads(capsys.readouterr().out)
+
+    assert report['class'] == 'profiled_config:Config'
+    assert set(report['initialise']) == {'a', 'b', 'missing'}
+    assert all(t >= 0 for t in report['initialise'].values())
+    assert set(report['initialise_stores']) == {'s'}
+    assert report['load'] > 0
+    assert report['class_creation'] > 0
+    assert report['freeze'] >= 0
+    assert report['access']['a']['repeat'] >= 0
+    assert 'KeyError' in report['access']['missing']['error']
+    assert report['stores']['s'] > 0
+
+    main(['profiled_config.Config', '--json'])
+    assert json.loads(capsys.readouterr().out)['class_creation'] is None  # already imported
+
+    main(['profiled_config.Config'])
+    out = capsys.readouterr().out
+    assert 'class creation' in out
+    assert 'missing' in out
+
+    with pytest.raises(SystemExit):
+        main(['profiled_config:NotThere'])
+
+
+def test_http_store(tmp_path):
+    import http.client
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from bonfig.remote import HTTPStore, ConnectionPool
+
+    documents = {'/a.json': {'A': {'a': 'one'}}, '/b.json': {'A': {'a': 'two'}}}
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            requests.append((self.path, self.client_address[1], self.headers.get('If-None-Match')))
+            if self.path not in documents:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = json.dumps(documents[self.path]).encode()
+            etag = '"{}"'.format(hash(body))
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+    pool = ConnectionPool()
+    cache_dir = str(tmp_path / 'cache')
+
+    try:
+        class Config(Bonfig):
+            s = Store()
+            a = s.Section('A').Field()
+
+            def load(self, name):
+                self.s = HTTPStore(url + '/' + name, cache_dir=cache_dir, pool=pool)
+
+        assert Config('a.json').a == 'one'
+
+        store = HTTPStore(url + '/a.json', pool=pool)
+        assert store.refresh() is False  # not modified
+        assert requests[-1][2] is not None
+        documents['/a.json'] = {'A': {'a': 'changed'}}
+        assert store.refresh() is True
+        assert store['A']['a'] == 'changed'
+        assert len({port for path, port, etag in requests}) == 1  # one connection re-used throughout
+
+        a, b = HTTPStore.fetch_many([url + '/a.json', url + '/b.json'], pool=pool)
+        assert a['A']['a'] == 'changed'
+        assert b['A']['a'] == 'two'
+
+        with pytest.raises(OSError):
+            HTTPStore(url + '/missing.json', pool=pool)
+    finally:
+        server.shutdown()
+        server.server_close()
+        pool.close()
+
+    # server now unreachable, falls back to disk cache
+    c = Config('a.json')
+    assert c.a == 'one'
+
+    class BrokenPool:
+        def request(self, method, url, headers=None):
+            raise http.client.IncompleteRead(b'{"A": ')
+
+    store = HTTPStore(url + '/a.json', cache_dir=cache_dir, pool=BrokenPool())
+    assert store.from_cache and store['A']['a'] == 'one'
+    with pytest.raises(http.client.HTTPException):
+        HTTPStore(url + '/a.json', pool=BrokenPool())
+
+
+def test_sqlite_store(tmp_path):
+    from bonfig.sqlite import SQLiteStore
+
+    db = str(tmp_path / 'config.db')
+
+    class Config(Bonfig):
+        s = Store()
+        A = s.Section()
+        a = A.Field()
+        n = A.IntField(5)
+        B = A.Section()
+        b = B.Field('b')
+        c = s.Field(default='fallback')
+
+        def load(self):
+            self.s = SQLiteStore(db)
+            self.s.preload_fields(self.__class__, 's')
+
+    c = Config(frozen=False)
+    assert c.n == 5
+    assert c.b == 'b'
+    assert c.s.dirty
+    c.a = 'a'
+    c.s.commit()
+    assert not c.s.dirty
+
+    store = SQLiteStore(db)
+    assert store['A']['a'] == 'a'
+    assert store['A']['B']['b'] == 'b'
+    assert set(store['A']) == {'a', 'n', 'B'}
+    assert store.connection.execute("SELECT count(*) FROM bonfig").fetchone()[0] == 3
+
+    c = Config()
+    assert c.a == 'a'
+    assert c.c == 'fallback'
+    assert set(c.s._values) >= {('A', 'a'), ('A', 'n'), ('A', 'B', 'b')}
+    with pytest.raises(TypeError):
+        c.a = 'frozen'
+
+    with store.transaction():
+        store['A']['a'] = 'changed'
+        del store['A']['B']
+        store['new'] = {'x': 1}
+    assert store['A']['a'] == 'changed'
+    assert 'B' not in store['A']
+    assert store['new']['x'] == 1
+
+    store['A']['n'] = 'before'
+    with pytest.raises(ValueError):
+        with store.transaction():
+            store['A']['a'] = 'failed'
+            store['failed'] = {'x': 1}
+            raise ValueError
+    assert store['A']['a'] == 'changed'
+    assert 'failed' not in store
+    assert store.dirty
+    store.commit()
+    assert store['A']['a'] == 'changed'
+    assert store['A']['n'] == 'before'
+
+    fresh = SQLiteStore(db)
+    assert fresh['A']['a'] == 'changed'
+    assert sorted(fresh) == ['A', 'new']
+    with pytest.raises(KeyError):
+        fresh['A']['B']
+
+    store['A']['a'] = None
+    assert store['A']['a'] is None
+    store.commit()
+    assert SQLiteStore(db)['A']['a'] is None
+
+
+def test_shared(tmp_path):
+    from bonfig import shared
+
+    class Config(Bonfig):
+        s = Store()
+        A = s.Section()
+        a = A.Field('a')
+        n = A.IntField(5)
+        B = A.Section()
+        b = B.Field('b')
+        AB = s.Field('top')
+        other = Store()
+        c = other.Field(default='fallback')
+
+        def load(self):
+            self.s = {}
+            self.other = {'d': [1, 2]}
+
+    c = Config()
+
+    fn = str(tmp_path / 'packed')
+    shared.share_file(c, fn)
+    attached = shared.attach_file(Config, fn)
+
+    assert attached.a == 'a'
+    assert attached.n == 5
+    assert attached.b == 'b'
+    assert attached.AB == 'top'
+    assert attached.c == 'fallback'
+    assert attached.other['d'] == [1, 2]
+    assert sorted(attached.s) == ['A', 'AB']
+    assert sorted(attached.s['A']) == ['B', 'a', 'n']
+    assert attached.diff(c) == []
+    with pytest.raises(TypeError):
+        attached.a = 'not allowed'
+
+    class BadKey(Bonfig):
+        s = Store()
+        a = s.Field('a', name='a\x1fb')
+
+    with pytest.raises(ValueError):
+        shared.pack(BadKey())
+
+    if shared.shared_memory is not None:
+        block = shared.share(c)
+        try:
+            attached = shared.attach(Config, block.name)
+            assert attached.b == 'b'
+            assert attached.s['A']['n'] == '5'
+        finally:
+            del attached
+            block.close()
+            block.unlink()
+
+
+def test_prepare_fork():
+    import gc
+    from bonfig.fork import compact, prepare_fork
+
+    class Config(Bonfig):
+        s = Store()
+        A = s.Section()
+        a = A.Field(''.join(['sh', 'ared']))
+        b = s.Field('b')
+
+    c = Config()
+    store = c.s
+    compact(c)
+    assert c.s is not store
+    assert c.s == store
+    assert c.a == 'shared'
+    assert c.a is sys.intern('shared')
+
+    with pytest.raises(ValueError):
+        compact(Config(frozen=False))
+
+    if hasattr(gc, 'freeze'):
+        try:
+            assert prepare_fork(c) > 0
+        finally:
+            gc.unfreeze()
+
+
+def test_ini_store():
+    import configparser
+    from bonfig.stores import IniStore
+
+    class Config(Bonfig):
+        ini = Store()
+
+        A = ini.Section()
+        a = A.Field()
+        b = A.Field()
+        url = A.Field()
+
+        B = ini.Section()
+        ref = B.Field()
+        shared = B.Field()
+
+        def load(self, text, interpolation=configparser.BasicInterpolation()):
+            parser = configparser.ConfigParser(interpolation=interpolation)
+            parser.read_string(text)
+            self.ini = IniStore(parser)
+
+    c = Config("[DEFAULT]\nshared = %(a)s-default\n"
+               "[A]\na = one\nb=two\nurl = http://%(a)s/%(b)s/%%\n"
+               "[B]\na = bee\nref = x")
+
+    assert c.a == 'one'
+    assert c.b == 'two'
+    assert c.url == 'http://one/two/%'
+    assert c.shared == 'bee-default'
+    assert c.ini['A']['shared'] == 'one-default'
+
+    text = ("[A]\na = one\nb = ${a}-two\nurl = http://${B:ref}/$$\n"
+            "[B]\nref = ${A:b}\nshared = ${ref}")
+    c = Config(text, configparser.ExtendedInterpolation(), frozen=False)
+
+    parser = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation())
+    parser.read_string(text)
+    assert c.url == parser['A']['url'] == 'http://one-two/$'
+    assert c.shared == parser['B']['shared']
+    assert type(c.ini['A']) is not dict and isinstance(c.ini['A'], dict)
+
+    c.a = 'changed'
+    assert c.b == 'changed-two'
+    assert c.url == 'http://changed-two/$'
+    assert c.shared == 'changed-two'
+
+    c.b = 'unrelated'
+    assert c.url == 'http://unrelated/$'
+
+    with pytest.raises(configparser.InterpolationDepthError):
+        c.b = '${url}'
+    assert c.b == 'unrelated'
+    assert c.url == 'http://unrelated/$'
+    c.a = 'still works'
+    assert c.a == 'still works'
+
+    with pytest.raises(configparser.InterpolationMissingOptionError):
+        Config("[A]\na = %(missing)s")
+
+    with pytest.raises(configparser.InterpolationDepthError):
+        Config("[A]\na = %(b)s\nb = %(a)s")
+
+    c = Config("[DEFAULT]\nshared = default\n[A]\na = 1\n[B]\nshared = own", frozen=False)
+    c.ini['DEFAULT']['shared'] = 'new default'
+    assert c.ini['A']['shared'] == 'new default'
+    assert c.shared == 'own'
+
+    c = Config("[DEFAULT]\nshared = same\n[A]\na = 1\n[B]\nshared = same", frozen=False)
+    c.ini['DEFAULT']['shared'] = 'new default'
+    assert c.ini['A']['shared'] == 'new default'
+    assert c.shared == 'same'
+    c.ini['A']['shared'] = 'set by A'
+    c.ini['DEFAULT']['shared'] = 'newer default'
+    assert c.ini['A']['shared'] == 'set by A'
+
+    frozen = Config("[A]\na = one")
+    assert frozen.a == 'one'
+    with pytest.raises(TypeError):
+        frozen.a = 'two'
+
+
+def test_secret_field():
+    import base64
+    import threading
+    from bonfig.fields import SecretField, decrypt_secrets, wipe_secrets
+
+    calls = []
+    threads = set()
+
+    def decryptor(val):
+        calls.append(val)
+        threads.add(threading.get_ident())
+        return bytearray(base64.b64decode(val))
+
+    def encrypt(val):
+        return base64.b64encode(val).decode()
+
+    class Config(Bonfig):
+        s = Store()
+        a = s.SecretField(encrypt(b'secret a'), decryptor=decryptor)
+        b = s.Section('B').SecretField(encrypt(b'secret b'), decryptor=decryptor, ttl=60)
+        plain = s.Field('plain')
+
+    c = Config()
+    assert c.s['a'] == encrypt(b'secret a')
+    decrypt_secrets(c)
+    assert len(calls) == 2
+
+    assert c.a == b'secret a'
+    assert c.b == b'secret b'
+    assert len(calls) == 2
+    assert 'secret' not in repr(Config.a)
+    assert 'secret a' not in repr(vars(c))
+
+    value = c.a
+    Config.a.wipe(c)
+    assert value == bytearray(8)
+    assert c.a == b'secret a'
+    assert len(calls) == 3
+
+    with c.edit() as tx:
+        tx.a = encrypt(b'rotated')
+    c = tx.result
+    assert c.a == b'rotated'
+    assert len(calls) == 4
+
+    wipe_secrets(c)
+    assert '_field_cache' in vars(c) and not vars(c)['_field_cache']
+
+    with pytest.raises(ValueError, match='decryptor'):
+        class NoDecryptor(Bonfig):
+            s = Store()
+            a = s.SecretField()
+
+
+def test_config_frame():
+    from bonfig.frame import ConfigFrame
+
+    class Run(Bonfig):
+        s = Store()
+        lr = s.FloatField()
+        epochs = s.IntField()
+        optimiser = s.Field()
+        seed = s.IntField(default=0)
+        version = s.Field('v1')
+
+        def load(self, lr, epochs, optimiser, **extra):
+            self.s = {'lr': str(lr), 'epochs': str(epochs), 'optimiser': optimiser}
+            self.s.update(extra)
+
+    params = [(0.1, 10, 'adam'), (0.001, 20, 'sgd'), (0.05, 5, 'adam'), (0.01, 30, 'adam')]
+    runs = [Run(*p) for p in params]
+    runs.append(Run(0.2, 1, 'sgd', seed='7'))
+
+    frames = [ConfigFrame.from_instances(Run, runs),
+              ConfigFrame.from_stores(Run, [{'s': dict(run.s)} for run in runs])]
+
+    for frame in frames:
+        assert len(frame) == 5
+        assert frame.columns == ['epochs', 'lr', 'optimiser', 'seed', 'version']
+        assert frame['seed'].tolist() == [0, 0, 0, 0, 7]
+        assert frame['version'].unique() == ['v1']
+
+        adam = frame[(frame['lr'] > 0.01) & (frame['optimiser'] == 'adam')]
+        assert len(adam) == 2
+        assert sorted(adam['lr'].tolist()) == [0.05, 0.1]
+        assert adam['epochs'].sum() == 15
+        assert adam['epochs'].mean() == 7.5
+
+        assert len(frame[~(frame['optimiser'] == 'adam')]) == 2
+        assert len(frame[frame['optimiser'].isin(['sgd'])]) == 2
+
+        ordered = frame.sort('lr', reverse=True)
+        assert ordered['lr'][0] == 0.2
+        assert ordered['epochs'].tolist() == [1, 10, 5, 30, 20]
+        assert frame['lr'].max() == 0.2
+        assert frame['lr'].min() == 0.001
+
+        best = ordered.instance(0)
+        assert isinstance(best, Run)
+        assert best._frozen
+        assert best.epochs == 1
+        assert best.seed == 7
+        assert [r.epochs for r in adam.instances()] == [10, 5]
+
+    rows = [{'s': {'lr': '0.1', 'epochs': '1', 'optimiser': 'adam'}}, {'s': {'epochs': '2', 'optimiser': 'sgd'}}]
+    frame = ConfigFrame.from_stores(Run, rows)
+    assert frame.instance(0).version == 'v1'
+    assert rows[0] == {'s': {'lr': '0.1', 'epochs': '1', 'optimiser': 'adam'}}
+    assert list(frame['lr'] > 0.05) == [True, False]
+    assert list(frame['lr'] == 0.1) == [True, False]
+
+
+def test_config_frame_numpy():
+    numpy = pytest.importorskip('numpy')
+    from bonfig.frame import ConfigFrame
+
+    class Run(Bonfig):
+        s = Store()
+        lr = s.FloatField()
+
+    frame = ConfigFrame.from_stores(Run, [{'s': {'lr': '0.1'}}, {'s': {}}, {'s': {'lr': '0.001'}}])
+    assert frame['lr'].data.dtype == object
+    assert (frame['lr'] > 0.01).data.tolist() == [True, False, False]
+    assert (frame['lr'] <= 0.01).data.tolist() == [False, False, True]
+    assert isinstance((frame['lr'] != 0.1).data, numpy.ndarray)
+    assert frame[frame['lr'] < 1].columns == ['lr']
+
+
+def test_bulk_stream(tmp_path):
+    import concurrent.futures
+    import json
+
+    from bonfig.bulk import stream, loads, Layout
+
+    class Tenant(Bonfig):
+        s = Store()
+        name = s.Field()
+        limits = s.Section('limits')
+        quota = limits.IntField(default=10)
+        ratio = limits.FloatField()
+        region = s.Field('eu')
+
+    records = [{'name': 'acme', 'ratio': 0.5},
+               {'name': 'globex', 'quota': 250, 'ratio': 1.5, 'region': 'us'}]
+    jsonl = tmp_path / 'tenants.jsonl'
+    jsonl.write_text('\n'.join(json.dumps(r) for r in records) + '\n\n')
+    csv_path = tmp_path / 'tenants.csv'
+    csv_path.write_text('name,quota,ratio\nacme,,0.5\nglobex,250,1.5\n')
+
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        parallel = list(stream(Tenant, str(jsonl), executor=executor, chunksize=1))
+
+    for tenants in (list(stream(Tenant, str(jsonl))), list(stream(Tenant, csv_path)), parallel):
+        acme, globex = tenants
+        assert isinstance(acme, Tenant) and acme._frozen
+        assert (acme.name, acme.quota, acme.ratio, acme.region) == ('acme', 10, 0.5, 'eu')
+        assert (globex.name, globex.quota, globex.ratio, globex.region) == ('globex', 250, 1.5, 'eu')
+        assert globex.s == {'name': 'globex', 'region': 'eu', 'limits': {'quota': '250', 'ratio': '1.5'}}
+        with pytest.raises(TypeError):
+            globex.s['limits']['quota'] = '1'
+
+    acme, globex = loads(Tenant, jsonl.read_text(), 'jsonl', views=True)
+    assert (acme.name, acme.quota, acme.ratio, acme.region) == ('acme', 10, 0.5, 'eu')
+    assert globex.quota == 250
+    assert globex.instance().quota == 250
+    with pytest.raises(AttributeError):
+        acme.nope
+
+    assert Layout.of(Tenant) is Layout.of(Tenant)
+    with pytest.raises(ValueError):
+        list(stream(Tenant, str(tmp_path / 'tenants.txt')))
+
+
+def test_bulk_stored_strings():
+    from bonfig.bulk import loads, Layout
+
+    class Event(Bonfig):
+        s = Store()
+        day = s.DatetimeField(fmt='%Y-%m-%d')
+        at = s.IsoDatetimeField()
+        path = s.PathField()
+
+    texts = {'jsonl': '{"day": "2020-02-29", "at": "2020-02-29T12:30:00", "path": "logs/events"}\n',
+             'csv': 'day,at,path\n2020-02-29,2020-02-29T12:30:00,logs/events\n'}
+    for format, text in texts.items():
+        for views in (False, True):
+            event, = loads(Event, text, format, views=views)
+            assert event.day == datetime.datetime(2020, 2, 29)
+            assert event.at == datetime.datetime(2020, 2, 29, 12, 30)
+            assert event.path == pathlib.Path('logs/events')
+
+    native = Layout.of(Event).build({'day': datetime.datetime(2021, 1, 2), 'path': pathlib.Path('a') / 'b'})
+    assert native.s['day'] == '2021-01-02'
+    assert native.path == pathlib.Path('a/b')
+
+
+def test_write_behind(tmp_path):
+    import json
+    import time
+
+    from bonfig.persist import WriteBehind, JSONFileWriter, _flush_all
+    from bonfig.sqlite import SQLiteStore
+
+    class Config(Bonfig):
+        s = Store()
+        a = s.Section('A').Field()
+        b = s.Section('B').IntField()
+
+        def load(self):
+            self.s = {'A': {'a': 'one'}, 'B': {'b': '1'}}
+
+    path = tmp_path / 'config.json'
+    c = Config(frozen=False)
+    persist = WriteBehind(c, {'s': JSONFileWriter(path)}, interval=None)
+
+    c.a = 'two'
+    c.a = 'three'
+    assert persist.dirty == {('s', 'A', 'a')}
+    assert not path.exists()
+    assert persist.flush() == {('s', 'A', 'a')}
+    assert json.loads(path.read_text()) == {'A': {'a': 'three'}, 'B': {'b': '1'}}
+    assert not persist.dirty
+
+    path.chmod(0o644)
+    c.a = 'three'
+    persist.flush()
+    assert path.stat().st_mode & 0o777 == 0o644
+
+    calls = []
+    writer = persist.writers['s']
+    persist.writers['s'] = lambda store, paths: (calls.append(paths), writer(store, paths))
+    c.b = 2
+    _flush_all()
+    assert calls == [{('B', 'b')}]
+    assert json.loads(path.read_text()) == {'A': {'a': 'three'}, 'B': {'b': '2'}}
+
+    def fail(store, paths):
+        raise OSError
+    persist.writers['s'] = fail
+    c.a = 'four'
+    with pytest.raises(OSError):
+        persist.flush()
+    assert persist.dirty == {('s', 'A', 'a')}
+    persist.writers['s'] = writer
+    persist.close()
+    c.b = 3
+    assert json.loads(path.read_text()) == {'A': {'a': 'four'}, 'B': {'b': '2'}}
+
+    c = Config(frozen=False)
+    with WriteBehind(c, {'s': JSONFileWriter(path, indent=2)}, interval=0.05) as persist:
+        c.b = 5
+        for _ in range(100):
+            if not persist.dirty:
+                break
+            time.sleep(0.02)
+        assert not persist.dirty
+        assert json.loads(path.read_text())['B'] == {'b': '5'}
+
+    class DBConfig(Bonfig):
+        s = Store()
+        a = s.Section('A').Field()
+
+        def load(self, database):
+            self.s = SQLiteStore(database)
+
+    database = str(tmp_path / 'config.db')
+    c = DBConfig(database, frozen=False)
+    c.s['A'] = {}
+    with WriteBehind(c, interval=None) as persist:
+        c.a = 'one'
+        assert c.s.dirty
+    assert not c.s.dirty
+    assert DBConfig(database).a == 'one'
+
+    with WriteBehind(c, interval=0.05) as persist:
+        c.a = 'timed'
+        for _ in range(100):
+            if not c.s.dirty:
+                break
+            time.sleep(0.02)
+        assert not c.s.dirty
+    assert DBConfig(database).a == 'timed'
+
+    with pytest.raises(ValueError):
+        WriteBehind(Config(frozen=False))
+
+
+def test_override():
+    import asyncio
+    import threading
+
+    class Config(Bonfig):
+        s = Store()
+        port = s.IntField(80)
+        host = s.Section('A').Field('localhost')
+
+    c, other = Config(), Config()
+
+    with c.override(port='8080') as same:
+        assert same is c
+        assert c.port == 8080
+        assert other.port == 80
+        assert c.s['port'] == '80'
+        with c.override(host='example.com'):
+            assert (c.port, c.host) == (8080, 'example.com')
+        assert c.host == 'localhost'
+
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(c.port))
+        thread.start()
+        thread.join()
+        assert seen == [80]
+    assert c.port == 80
+
+    with pytest.raises(ValueError):
+        with c.override(port='eighty'):
+            pass
+    with pytest.raises(AttributeError):
+        with c.override(nope=1):
+            pass
+
+    async def task(port):
+        with c.override(port=port):
+            await asyncio.sleep(0.01)
+            return c.port
+
+    async def main():
+        return await asyncio.gather(task(1), task(2))
+
+    assert asyncio.run(main()) == [1, 2]
+    assert c.port == 80
+
+
+def test_default_factory():
+    import re
+
+    calls = []
+
+    def table():
+        calls.append(1)
+        return {'a': 1}
+
+    class Config(Bonfig):
+        s = Store()
+        lookup = s.Field(default_factory=table)
+        pattern = s.Section('A').Field(default_factory=lambda: re.compile('[a-z]+'), memoise='class')
+        nothing = s.IntField(default_factory=lambda: None)
+        home = s.PathField(default_factory=lambda: pathlib.Path.home() / '.config')
+        count = s.IntField(default_factory=lambda: 'not converted')
+
+        def load(self):
+            self.s = {'A': {}}
+
+    assert calls == []
+    c, d = Config(), Config()
+    assert c.lookup == {'a': 1}
+    assert c.lookup is c.lookup
+    assert calls == [1]
+    assert d.lookup is not c.lookup
+    assert c.pattern is d.pattern
+    assert c.nothing is None
+    assert c.home == pathlib.Path.home() / '.config'
+    assert c.count == 'not converted'
+    assert 'lookup' not in c.s
+
+    e = Config(frozen=False)
+    e.count = 5
+    assert e.count == 5
+
+    with pytest.raises(ValueError):
+        Config.s.Field(default='a', default_factory=list)
+    with pytest.raises(ValueError):
+        Config.s.Field(default_factory=list, memoise='thread')
+
+    base = Config.s.PathField('base', default_factory=pathlib.Path.home, memoise='class')
+    sub = base / 'sub'
+    assert (sub.val, sub.default_factory, sub.memoise) == (pathlib.Path('base') / 'sub', pathlib.Path.home, 'class')
+
+
+def test_section_view():
+    from bonfig.fields import SectionView
+
+    class Config(Bonfig):
+        s = Store()
+        A = s.Section()
+        B = A.Section()
+        a = A.Field('one')
+        n = A.IntField(2, name='number')
+        missing = A.Field(default='fallback')
+        b = B.Field('two')
+        secret = B.SecretField(decryptor=str.upper, default='shh')
+
+    c = Config()
+    view = c.A
+    assert isinstance(view, SectionView)
+    assert Config.A is not view and isinstance(Config.A, Section)
+    assert (view.keys, view.name) == (['A'], 'A')
+    assert (view.a, view.n, view.missing) == ('one', 2, 'fallback')
+    assert list(view) == ['a', 'missing', 'n']
+    assert view.read() == {'a': 'one', 'missing': 'fallback', 'n': 2}
+    assert view.read('a') == {'a': 'one'}
+    assert c.A.B.b == 'two'
+    assert c.A.B.read() == {'b': 'two', 'secret': 'SHH'}
+    assert c.B.keys == ['A', 'B']
+
+    with c.override(a='overridden'):
+        assert view.a == 'overridden'
+
+    with c.edit() as tx:
+        tx.a = 'new'
+    assert tx.result.A.a == 'new'
+    assert view.a == 'one'
+
+    with pytest.raises(AttributeError):
+        view.nope
+
+    class Empty(Bonfig):
+        s = Store()
+        A = s.Section()
+        a = A.Field()
+
+    e = Empty()
+    assert e.A.keys == ['A']
+    with pytest.raises(KeyError):
+        e.A.a
+
+    class Defaults(Bonfig):
+        s = Store()
+        A = s.Section()
+        a = A.Field(default='fallback')
+        items = A.Field(default_factory=list)
+        B = A.Section()
+        b = B.IntField(default='2')
+        required = A.Field()
+
+        def load(self):
+            self.s = {}
+
+    d = Defaults()
+    assert (d.A.a, d.A.items, d.A.B.b) == (d.a, d.items, d.b) == ('fallback', [], 2)
+    assert d.A.items is d.items
+    assert d.A.read('a', 'items') == {'a': 'fallback', 'items': []}
+    with pytest.raises(KeyError):
+        d.A.required
+
+
+def test_blob_field():
+    import base64
+    import gc
+    import zlib
+
+    from bonfig.fields import _instance_cache
+
+    payload = b'-----BEGIN CERTIFICATE-----' * 1000
+
+    class Config(Bonfig):
+        s = Store()
+        z = s.BlobField(payload)
+        x = s.BlobField(payload, compression='lzma')
+        plain = s.BlobField(compression=None, budget=len(payload) * 2)
+
+        def load(self):
+            self.s = {'plain': base64.b64encode(payload).decode('ascii')}
+
+    c = Config()
+    assert len(c.s['z']) < len(payload) / 10
+    assert zlib.decompress(base64.b64decode(c.s['z'])) == payload
+    for name in ('z', 'x', 'plain'):
+        value = getattr(c, name)
+        assert isinstance(value, memoryview) and value.readonly
+        assert value == payload
+        assert getattr(c, name).obj is value.obj
+    assert c.z[:27].tobytes() == b'-----BEGIN CERTIFICATE-----'
+
+    with c.edit() as tx:
+        tx.z = b'new'
+    c = tx.result
+    assert c.z == b'new'
+
+    u = Config(frozen=False)
+    assert u.z.obj is not u.z.obj
+
+    configs = [Config() for _ in range(3)]
+    for config in configs:
+        config.plain
+    assert Config.plain.nbytes == len(payload) * 2
+    assert Config.plain not in _instance_cache(configs[0])
+    assert Config.plain in _instance_cache(configs[2])
+
+    configs[2].plain
+    Config.plain.release(configs[2])
+    assert Config.plain not in _instance_cache(configs[2])
+    assert Config.plain.nbytes <= len(payload) * 2
+    del configs
+    gc.collect()
+    assert Config.plain.nbytes <= len(payload)
+
+    with pytest.raises(ValueError):
+        Config.s.BlobField(compression='bz2')
+
+
+def test_native_types():
+    import json
+
+    class Config(Bonfig):
+        s = Store(native_types=(int, float, bool))
+        ini = Store()
+        n = s.IntField(1)
+        x = s.Section('A').FloatField(2.5)
+        b = s.BoolField(True)
+        name = s.Field('a')
+        ini_n = ini.IntField(1)
+
+        with s as proxy:
+            m = proxy.IntField(3)
+
+    c = Config(frozen=False)
+    assert c.s == {'n': 1, 'A': {'x': 2.5}, 'b': True, 'name': 'a', 'm': 3}
+    assert c.ini == {'ini_n': '1'}
+    assert (c.n, c.x, c.b, c.m, c.ini_n) == (1, 2.5, True, 3, 1)
+    assert json.loads(json.dumps(c.s)) == c.s
+
+    c.n = '5'
+    c.b = 'False'
+    c.x = 1
+    assert c.s['n'] == 5 and c.s['b'] is False and type(c.s['A']['x']) is float
+    assert (c.n, c.b) == (5, False)
+
+    c.s['n'] = '7'
+    c.s['A']['x'] = 3
+    c.s['b'] = 'True'
+    assert (c.n, c.x, c.b) == (7, 3.0, True)
+    assert type(c.x) is float
+
+    with c.edit() as tx:
+        tx.n = 9
+    assert c.s['n'] == 9
+
+
+def test_fingerprint():
+    import types
+
+    from bonfig.core import _digest
+
+    class Config(Bonfig):
+        s = Store()
+        t = Store()
+        A = s.Section()
+        B = s.Section()
+        a = A.Field('one')
+        n = A.IntField(1)
+        b = B.Field('two')
+        other = t.Field('x')
+
+    c, d = Config(), Config()
+    assert c.fingerprint() == d.fingerprint()
+    assert c != d
+    assert len({c.fingerprint(): c, d.fingerprint(): d}) == 1
+    assert c.fingerprint(Config.A) == c.A.fingerprint()
+    assert c.fingerprint(Config.A) != c.fingerprint(Config.B)
+    assert c.fingerprint(Config.t) == d.fingerprint(Config.t)
+
+    with d.edit() as tx:
+        tx.a = 'changed'
+    d = tx.result
+    assert c.fingerprint() != d.fingerprint()
+    assert c.fingerprint(Config.B) == d.fingerprint(Config.B)
+    assert c.fingerprint(Config.n) == d.fingerprint(Config.n)
+    assert c.fingerprint(Config.a) != d.fingerprint(Config.a)
+
+    hashed = []
+
+    def counting(node, cache):
+        if type(node) is types.MappingProxyType and (cache is None or id(node) not in cache):
+            hashed.append(node)
+        return _digest(node, cache)
+
+    import bonfig.core
+    original, bonfig.core._digest = bonfig.core._digest, counting
+    try:
+        c.fingerprint()
+        assert hashed == []
+        with c.edit() as tx:
+            tx.a = 'changed'
+        c = tx.result
+        hashed.clear()
+        c.fingerprint()
+    finally:
+        bonfig.core._digest = original
+    assert hashed == [c.s, c.s['A']]
+    assert c.fingerprint() == d.fingerprint()
+
+    for i in range(20):
+        with c.edit() as tx:
+            tx.b = str(i)
+        c = tx.result
+        c.fingerprint()
+    assert len(c.__dict__['_fingerprints']) <= 2 * 4 + 16
+
+    u = Config(frozen=False)
+    assert u.fingerprint() == Config().fingerprint()
+    u.n = 2
+    assert u.fingerprint() != Config().fingerprint()
+    h = hash(u)
+    u.freeze()
+    assert hash(u) == h
+
+
+def test_timing_listeners():
+    from bonfig.core import TimingEvent
+
+    events, base_events = [], []
+
+    class Config(Bonfig):
+        s = Store()
+        t = Store()
+        a = s.Section('A').Field('one')
+        b = t.IntField(2)
+
+        def load(self):
+            self.s = {}
+            self.t = {}
+
+    remove_base = Bonfig.add_listener(base_events.append)
+    remove = Config.add_listener(events.append)
+    try:
+        class Sub(Config):
+            c = Config.s.Field('three')
+
+        assert [e.phase for e in base_events] == ['class']
+        assert base_events[0].bonfig_cls is Sub and base_events[0].duration >= 0
+        assert events == base_events
+
+        events.clear()
+        base_events.clear()
+        c = Sub()
+        phases = [(e.phase, e.store_attr) for e in events]
+        assert phases == [('load', None), ('initialise', 's'), ('initialise', 't'), ('freeze', 's'), ('freeze', 't')]
+        assert all(isinstance(e, TimingEvent) and e.bonfig is c and e.bonfig_cls is Sub for e in events)
+        assert events[-2].size > 0 and events[0].size is None
+        assert (c.a, c.b, c.c) == ('one', 2, 'three')
+        assert base_events == events
+
+        events.clear()
+        u = Config(frozen=False)
+        assert [e.phase for e in events] == ['load', 'initialise', 'initialise']
+        events.clear()
+        u.freeze()
+        assert [e.phase for e in events] == ['freeze', 'freeze']
+    finally:
+        remove()
+        remove_base()
+        remove()
+
+    events.clear()
+    Config()
+    assert events == []
+
+    from bonfig.core import BonfigType
+    from bonfig.stores import BaseStore
+
+    class Lazy(BaseStore):
+        def __init__(self):
+            self.data = {}
+            self.iterated = False
+
+        def __getitem__(self, key):
+            return self.data[key]
+
+        def __setitem__(self, key, value):
+            self.data[key] = value
+
+        def __delitem__(self, key):
+            del self.data[key]
+
+        def __iter__(self):
+            self.iterated = True
+            return iter(self.data)
+
+        def __len__(self):
+            return len(self.data)
+
+        def frozen(self):
+            return self
+
+    class LazyConfig(Bonfig):
+        s = Store()
+        a = s.Field('one')
+
+        def load(self):
+            self.s = Lazy()
+
+    remove = LazyConfig.add_listener(events.append)
+    try:
+        c = LazyConfig()
+    finally:
+        remove()
+    assert [(e.phase, e.size) for e in events] == [('load', None), ('initialise', None), ('freeze', None)]
+    assert not c.s.iterated
+
+    namespace = {'s': Store()}
+    namespace['a'] = namespace['s'].Field('one')
+    remove = Bonfig.add_listener(events.append)
+    try:
+        Named = BonfigType('Named', (Bonfig,), namespace)
+    finally:
+        remove()
+    assert events[-1].bonfig_cls is Named
+    assert set(namespace) == {'s', 'a', '__fields__', '__store_attrs__', '__store_fields__'}